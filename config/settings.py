@@ -1,51 +1,161 @@
 """
 Configuration settings for the tax assistant application.
 Loads from environment variables with sensible defaults.
+
+Settings are resolved lazily on first access and cached; existing
+``from config.settings import DATABASE_URL`` style imports keep working
+through the module-level ``__getattr__``. Set ``SETTINGS_CACHE=0`` to force
+the environment to be re-read on every access. Set ``TAX_ENV_CACHE=1`` to
+reuse a pickled parse of the .env file until the file changes.
 """
 
 import os
+import pickle
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+from dotenv import load_dotenv, find_dotenv, dotenv_values
 
 # Base directory
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# Database
-DATABASE_URL = os.getenv('DATABASE_URL', f'sqlite:///{BASE_DIR}/data/tax_assistant.db')
+# Parsed .env cache (used when TAX_ENV_CACHE=1)
+ENV_CACHE_PATH = Path.home() / '.cache' / 'tax_assistant' / 'env.pkl'
+
+
+def _env_flag(name, default):
+    """Read a 'true'/'false' feature flag from the environment."""
+    return os.getenv(name, default).lower() == 'true'
+
+
+def _load_env_cached():
+    """
+    Load the .env file into os.environ, reusing a pickled parse.
+
+    The cache is keyed by the .env path, mtime and size, so edits to the
+    file are picked up on the next run. Like load_dotenv(), existing
+    environment variables are never overridden.
+    """
+    env_path = find_dotenv()
+    if not env_path:
+        return
+
+    stat = os.stat(env_path)
+    key = (env_path, stat.st_mtime_ns, stat.st_size)
+
+    values = None
+    try:
+        with open(ENV_CACHE_PATH, 'rb') as f:
+            cached_key, cached_values = pickle.load(f)
+        if cached_key == key:
+            values = cached_values
+    except Exception:
+        pass
+
+    if values is None:
+        values = dotenv_values(env_path)
+        try:
+            ENV_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+            with open(ENV_CACHE_PATH, 'wb') as f:
+                pickle.dump((key, values), f)
+        except OSError:
+            pass
+
+    for name, value in values.items():
+        if value is not None:
+            os.environ.setdefault(name, value)
+
+
+@dataclass(frozen=True)
+class Settings:
+    """Resolved application settings."""
+
+    # Database
+    DATABASE_URL: str
+
+    # Tax Year
+    DEFAULT_TAX_YEAR: int
+
+    # Entity Configuration
+    FARM_ENTITY_NAME: str
+    EQUIPMENT_ENTITY_NAME: str
+    GRAIN_ENTITY_NAME: str
+
+    # State
+    STATE: str
+
+    # Accounting Methods
+    FARM_ACCOUNTING_METHOD: str
+    EQUIPMENT_ACCOUNTING_METHOD: str
+    GRAIN_ACCOUNTING_METHOD: str
+
+    # Filing Status
+    FILING_STATUS: str
+    LA_FILING_STATUS: str
+
+    # Reporting
+    REPORT_OUTPUT_DIR: Path
+    BACKUP_DIR: Path
+
+    # Feature Flags
+    ENABLE_FARM_INCOME_AVERAGING: bool
+    ENABLE_SECTION_179: bool
+    ENABLE_BONUS_DEPRECIATION: bool
+
+
+@lru_cache(maxsize=1)
+def _load_settings():
+    """Load environment variables and build the Settings object."""
+    if os.getenv('TAX_ENV_CACHE') == '1':
+        _load_env_cached()
+    else:
+        load_dotenv()
+
+    return Settings(
+        DATABASE_URL=os.getenv('DATABASE_URL', f'sqlite:///{BASE_DIR}/data/tax_assistant.db'),
+        DEFAULT_TAX_YEAR=int(os.getenv('DEFAULT_TAX_YEAR', '2024')),
+        FARM_ENTITY_NAME=os.getenv('FARM_ENTITY_NAME', 'Parker Farms'),
+        EQUIPMENT_ENTITY_NAME=os.getenv('EQUIPMENT_ENTITY_NAME', 'Parker Equipment Holdings LLC'),
+        GRAIN_ENTITY_NAME=os.getenv('GRAIN_ENTITY_NAME', 'Parker Grain Storage LLC'),
+        STATE=os.getenv('STATE', 'LA'),
+        FARM_ACCOUNTING_METHOD=os.getenv('FARM_ACCOUNTING_METHOD', 'cash'),
+        EQUIPMENT_ACCOUNTING_METHOD=os.getenv('EQUIPMENT_ACCOUNTING_METHOD', 'accrual'),
+        GRAIN_ACCOUNTING_METHOD=os.getenv('GRAIN_ACCOUNTING_METHOD', 'accrual'),
+        FILING_STATUS=os.getenv('FILING_STATUS', 'married_filing_jointly'),
+        LA_FILING_STATUS=os.getenv('LA_FILING_STATUS', 'married_filing_jointly'),
+        REPORT_OUTPUT_DIR=Path(os.getenv('REPORT_OUTPUT_DIR', str(BASE_DIR / 'reports'))),
+        BACKUP_DIR=Path(os.getenv('BACKUP_DIR', str(BASE_DIR / 'data' / 'backups'))),
+        ENABLE_FARM_INCOME_AVERAGING=_env_flag('ENABLE_FARM_INCOME_AVERAGING', 'true'),
+        ENABLE_SECTION_179=_env_flag('ENABLE_SECTION_179', 'true'),
+        ENABLE_BONUS_DEPRECIATION=_env_flag('ENABLE_BONUS_DEPRECIATION', 'true'),
+    )
 
-# Tax Year
-DEFAULT_TAX_YEAR = int(os.getenv('DEFAULT_TAX_YEAR', '2024'))
 
-# Entity Configuration
-FARM_ENTITY_NAME = os.getenv('FARM_ENTITY_NAME', 'Parker Farms')
-EQUIPMENT_ENTITY_NAME = os.getenv('EQUIPMENT_ENTITY_NAME', 'Parker Equipment Holdings LLC')
-GRAIN_ENTITY_NAME = os.getenv('GRAIN_ENTITY_NAME', 'Parker Grain Storage LLC')
+def get_settings():
+    """
+    Get the application settings.
 
-# State
-STATE = os.getenv('STATE', 'LA')
+    The environment is parsed once and cached. Setting SETTINGS_CACHE=0
+    bypasses the cache so changes to the environment are picked up.
 
-# Accounting Methods
-FARM_ACCOUNTING_METHOD = os.getenv('FARM_ACCOUNTING_METHOD', 'cash')
-EQUIPMENT_ACCOUNTING_METHOD = os.getenv('EQUIPMENT_ACCOUNTING_METHOD', 'accrual')
-GRAIN_ACCOUNTING_METHOD = os.getenv('GRAIN_ACCOUNTING_METHOD', 'accrual')
+    Returns:
+        Settings object
+    """
+    if os.getenv('SETTINGS_CACHE', '1') == '0':
+        _load_settings.cache_clear()
+    return _load_settings()
 
-# Filing Status
-FILING_STATUS = os.getenv('FILING_STATUS', 'married_filing_jointly')
-LA_FILING_STATUS = os.getenv('LA_FILING_STATUS', 'married_filing_jointly')
 
-# Reporting
-REPORT_OUTPUT_DIR = Path(os.getenv('REPORT_OUTPUT_DIR', str(BASE_DIR / 'reports')))
-BACKUP_DIR = Path(os.getenv('BACKUP_DIR', str(BASE_DIR / 'data' / 'backups')))
+def ensure_dirs():
+    """Create the data, report and backup directories if missing."""
+    settings = get_settings()
+    settings.REPORT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    settings.BACKUP_DIR.mkdir(parents=True, exist_ok=True)
+    (BASE_DIR / 'data').mkdir(parents=True, exist_ok=True)
 
-# Feature Flags
-ENABLE_FARM_INCOME_AVERAGING = os.getenv('ENABLE_FARM_INCOME_AVERAGING', 'true').lower() == 'true'
-ENABLE_SECTION_179 = os.getenv('ENABLE_SECTION_179', 'true').lower() == 'true'
-ENABLE_BONUS_DEPRECIATION = os.getenv('ENABLE_BONUS_DEPRECIATION', 'true').lower() == 'true'
 
-# Ensure directories exist
-REPORT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-BACKUP_DIR.mkdir(parents=True, exist_ok=True)
-(BASE_DIR / 'data').mkdir(parents=True, exist_ok=True)
+def __getattr__(name):
+    """Resolve module-level setting names (PEP 562)."""
+    if name in Settings.__dataclass_fields__:
+        return getattr(get_settings(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,6 +3,14 @@ Tax constants, rates, and thresholds for federal and Louisiana state taxes.
 Updated for 2024 tax year.
 """
 
+import sys
+from functools import lru_cache
+
+import numpy as np
+
+# Upper bound of the top bracket; finite so bracket tables stay integer
+TOP_BRACKET_MAX = 10**15
+
 # ===== FEDERAL TAX RATES (2024) =====
 
 # Income Tax Brackets (Married Filing Jointly)
@@ -13,7 +21,7 @@ FEDERAL_TAX_BRACKETS_MFJ_2024 = [
     {'min': 201050, 'max': 383900, 'rate': 0.24},
     {'min': 383900, 'max': 487450, 'rate': 0.32},
     {'min': 487450, 'max': 731200, 'rate': 0.35},
-    {'min': 731200, 'max': float('inf'), 'rate': 0.37}
+    {'min': 731200, 'max': TOP_BRACKET_MAX, 'rate': 0.37}
 ]
 
 # Income Tax Brackets (Single)
@@ -24,7 +32,7 @@ FEDERAL_TAX_BRACKETS_SINGLE_2024 = [
     {'min': 100525, 'max': 191950, 'rate': 0.24},
     {'min': 191950, 'max': 243725, 'rate': 0.32},
     {'min': 243725, 'max': 609350, 'rate': 0.35},
-    {'min': 609350, 'max': float('inf'), 'rate': 0.37}
+    {'min': 609350, 'max': TOP_BRACKET_MAX, 'rate': 0.37}
 ]
 
 # Standard Deductions (2024)
@@ -106,6 +114,17 @@ MACRS_CLASSES = {
     }
 }
 
+# Parallel per-class arrays indexed by MACRS_CLASS_CODES[class name], for
+# vectorized code that would otherwise do a nested dict lookup per asset.
+MACRS_CLASS_CODES = {name: code for code, name in enumerate(MACRS_CLASSES)}
+MACRS_RECOVERY = np.array([c['recovery_period'] for c in MACRS_CLASSES.values()], dtype=np.float64)
+MACRS_CONVENTION = np.array(  # 0 = half-year, 1 = mid-month
+    [c['convention'] == 'mid-month' for c in MACRS_CLASSES.values()], dtype=np.int8
+)
+MACRS_METHOD = np.array(  # 0 = DDB, 1 = SL
+    [c['depreciation_method'] == 'SL' for c in MACRS_CLASSES.values()], dtype=np.int8
+)
+
 # MACRS Depreciation Tables (Half-Year Convention)
 # Percentages for each year of the recovery period
 MACRS_DEPRECIATION_RATES_HY = {
@@ -119,6 +138,40 @@ MACRS_DEPRECIATION_RATES_HY = {
          0.0446, 0.0446, 0.0446, 0.0446, 0.0446, 0.0446, 0.0446, 0.0446, 0.0446, 0.0446, 0.0223]
 }
 
+# Dense (class, year) view of the half-year tables for vectorized depreciation.
+# Rows follow _MACRS_CLASS_INDEX; years past the end of a class are zero.
+_MACRS_CLASS_INDEX = {3: 0, 5: 1, 7: 2, 10: 3, 15: 4, 20: 5}
+MACRS_HY_TABLE = np.zeros((len(_MACRS_CLASS_INDEX), 21), dtype=np.float64)
+for _period, _row in _MACRS_CLASS_INDEX.items():
+    MACRS_HY_TABLE[_row, :len(MACRS_DEPRECIATION_RATES_HY[_period])] = MACRS_DEPRECIATION_RATES_HY[_period]
+
+# MACRS_HY_TABLE row per class code; -1 for classes without a half-year table
+MACRS_HY_ROW = np.array(
+    [_MACRS_CLASS_INDEX.get(int(p), -1) if MACRS_CONVENTION[code] == 0 else -1
+     for code, p in enumerate(MACRS_RECOVERY)],
+    dtype=np.intp
+)
+
+
+def depreciate(cost, class_idx, year_offset):
+    """
+    Vectorized half-year MACRS depreciation.
+
+    Args:
+        cost: MACRS basis per asset (array-like)
+        class_idx: Row in MACRS_HY_TABLE per asset (see _MACRS_CLASS_INDEX)
+        year_offset: Zero-based year of the recovery period per asset
+
+    Returns:
+        ndarray of depreciation amounts (zero outside the recovery period)
+    """
+    cost = np.asarray(cost, dtype=np.float64)
+    year_offset = np.asarray(year_offset)
+    in_range = (year_offset >= 0) & (year_offset < MACRS_HY_TABLE.shape[1])
+    rates = MACRS_HY_TABLE[np.asarray(class_idx), np.where(in_range, year_offset, 0)]
+    return cost * np.where(in_range, rates, 0.0)
+
+
 # MACRS Depreciation Rates (Mid-Month Convention) - for real property
 MACRS_DEPRECIATION_RATES_MM_27_5 = {
     # First year varies by month placed in service
@@ -128,6 +181,14 @@ MACRS_DEPRECIATION_RATES_MM_27_5 = {
     'full_year': 0.0364  # Years 2-27
 }
 
+# Integer-indexed view of the mid-month table: index 0 is unused, 1-12 are
+# the month placed in service, so lookups need no key formatting.
+MM_27_5_FIRST_YEAR = np.array(
+    [0.0] + [MACRS_DEPRECIATION_RATES_MM_27_5[f'month_{m}'] for m in range(1, 13)],
+    dtype=np.float64
+)
+MM_27_5_FULL_YEAR = MACRS_DEPRECIATION_RATES_MM_27_5['full_year']
+
 # ===== LOUISIANA STATE TAX =====
 
 # Louisiana Income Tax Brackets (2024)
@@ -135,7 +196,7 @@ MACRS_DEPRECIATION_RATES_MM_27_5 = {
 LA_TAX_BRACKETS_2024 = [
     {'min': 0, 'max': 12500, 'rate': 0.0185},       # 1.85%
     {'min': 12500, 'max': 50000, 'rate': 0.035},     # 3.5%
-    {'min': 50000, 'max': float('inf'), 'rate': 0.0425}  # 4.25%
+    {'min': 50000, 'max': TOP_BRACKET_MAX, 'rate': 0.0425}  # 4.25%
 ]
 
 # Louisiana Standard Deduction (2024)
@@ -223,6 +284,28 @@ FARM_EXPENSE_CATEGORIES = [
     'other_expenses'
 ]
 
+# Intern category names so membership and dict lookups compare by identity
+FARM_INCOME_CATEGORIES = [sys.intern(c) for c in FARM_INCOME_CATEGORIES]
+FARM_EXPENSE_CATEGORIES = [sys.intern(c) for c in FARM_EXPENSE_CATEGORIES]
+
+# O(1) membership checks; the lists above keep report ordering
+FARM_INCOME_SET = frozenset(FARM_INCOME_CATEGORIES)
+FARM_EXPENSE_SET = frozenset(FARM_EXPENSE_CATEGORIES)
+
+# Category -> small integer id, for indexing per-category treatment tables
+FARM_INCOME_ID = {c: i for i, c in enumerate(FARM_INCOME_CATEGORIES)}
+FARM_EXPENSE_ID = {c: i for i, c in enumerate(FARM_EXPENSE_CATEGORIES)}
+
+# Expense categories that can be prepaid farm supplies (feed, seed, fertilizer
+# and similar supplies), indexed by FARM_EXPENSE_ID
+FARM_EXPENSE_IS_PREPAID_ELIGIBLE = np.array(
+    [c in {'chemicals', 'feed', 'fertilizers_lime', 'seeds_plants', 'supplies'}
+     for c in FARM_EXPENSE_CATEGORIES],
+    dtype=bool
+)
+
+
+@lru_cache(maxsize=64)
 def get_tax_brackets(filing_status, year=2024, state=None):
     """
     Get tax brackets for a given filing status and year.
@@ -233,7 +316,7 @@ def get_tax_brackets(filing_status, year=2024, state=None):
         state: State code (e.g., 'LA') for state brackets, None for federal
 
     Returns:
-        List of tax bracket dictionaries
+        List of tax bracket dictionaries (shared module constant; do not mutate)
     """
     if state == 'LA':
         return LA_TAX_BRACKETS_2024
@@ -246,8 +329,42 @@ def get_tax_brackets(filing_status, year=2024, state=None):
         # Default to single for other filing statuses
         return FEDERAL_TAX_BRACKETS_SINGLE_2024
 
+
+# Standard deductions keyed by (state, filing_status); state None is federal
+_STD_DED = {}
+for _status, _amount in STANDARD_DEDUCTION_2024.items():
+    _STD_DED[(None, _status)] = _amount
+for _status, _amount in LA_STANDARD_DEDUCTION_2024.items():
+    _STD_DED[('LA', _status)] = _amount
+
+
 def get_standard_deduction(filing_status, year=2024, state=None):
     """Get standard deduction for filing status and year."""
-    if state == 'LA':
-        return LA_STANDARD_DEDUCTION_2024.get(filing_status, 0)
-    return STANDARD_DEDUCTION_2024.get(filing_status, 0)
+    return _STD_DED.get((state, filing_status), 0)
+
+
+# ===== CUMULATIVE BRACKET TAX =====
+
+def _with_cum(brackets):
+    """Attach 'cum_at_min', the tax owed on income below each bracket."""
+    cum = 0.0
+    out = []
+    for b in brackets:
+        out.append({**b, 'cum_at_min': cum})
+        if b['max'] != TOP_BRACKET_MAX:
+            cum += (b['max'] - b['min']) * b['rate']
+    return out
+
+
+# Tax within a bracket is b['cum_at_min'] + (income - b['min']) * b['rate']
+FEDERAL_TAX_BRACKETS_MFJ_2024 = _with_cum(FEDERAL_TAX_BRACKETS_MFJ_2024)
+FEDERAL_TAX_BRACKETS_SINGLE_2024 = _with_cum(FEDERAL_TAX_BRACKETS_SINGLE_2024)
+LA_TAX_BRACKETS_2024 = _with_cum(LA_TAX_BRACKETS_2024)
+
+
+def __getattr__(name):
+    """Re-export the bracket math from config.tax_math (PEP 562)."""
+    if name in ('compute_tax', '_BRACKETS'):
+        from config import tax_math
+        return getattr(tax_math, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
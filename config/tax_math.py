@@ -0,0 +1,127 @@
+"""
+Vectorized bracket tax math.
+
+Kept apart from the managers and models so pure calculation code can use
+it without importing SQLAlchemy; numpy is the only third-party import.
+"""
+
+from bisect import bisect_right
+
+import numpy as np
+
+from config.tax_constants import (
+    FEDERAL_TAX_BRACKETS_MFJ_2024,
+    FEDERAL_TAX_BRACKETS_SINGLE_2024,
+    LA_TAX_BRACKETS_2024
+)
+
+
+def _bracket_table(brackets):
+    """
+    Convert a bracket list into parallel NumPy arrays.
+
+    Returns:
+        Tuple of (thresholds, rates, cumulative tax owed at each threshold,
+        bracket widths)
+    """
+    thresholds = np.array([b['min'] for b in brackets], dtype=np.int64)
+    rates = np.array([b['rate'] for b in brackets], dtype=np.float64)
+    cumulative_tax = np.array([b['cum_at_min'] for b in brackets], dtype=np.float64)
+    widths = np.array([b['max'] for b in brackets], dtype=np.int64) - thresholds
+    return thresholds, rates, cumulative_tax, widths
+
+
+# Keyed the same way get_tax_brackets dispatches
+_BRACKET_SOURCES = {
+    ('federal', 'married_filing_jointly'): FEDERAL_TAX_BRACKETS_MFJ_2024,
+    ('federal', 'single'): FEDERAL_TAX_BRACKETS_SINGLE_2024,
+    ('LA', None): LA_TAX_BRACKETS_2024,
+}
+
+# Computed once at import
+_BRACKETS = {key: _bracket_table(brackets) for key, brackets in _BRACKET_SOURCES.items()}
+
+# (min, max, rate) rows with the original values, for per-bracket display
+_BRACKET_ROWS = {
+    key: tuple((b['min'], b['max'], b['rate']) for b in brackets)
+    for key, brackets in _BRACKET_SOURCES.items()
+}
+
+# The same thresholds, rates and cumulative tax as plain lists, for the
+# scalar path (bisect on a list beats a NumPy call for a single income)
+_BRACKET_LISTS = {
+    key: (thresholds.tolist(), rates.tolist(), cumulative_tax.tolist())
+    for key, (thresholds, rates, cumulative_tax, _) in _BRACKETS.items()
+}
+
+
+def _bracket_key(filing_status, state=None):
+    """Map a filing status/state pair to its _BRACKETS key."""
+    if state == 'LA':
+        return ('LA', None)
+    if filing_status == 'married_filing_jointly':
+        return ('federal', 'married_filing_jointly')
+    # Default to single for other filing statuses
+    return ('federal', 'single')
+
+
+def bracket_rows(filing_status, state=None):
+    """
+    Get the (min, max, rate) rows for a bracket table.
+
+    The tuple is built at import and shared, so calculators can hold it
+    without copying.
+
+    Args:
+        filing_status: 'single', 'married_filing_jointly', etc.
+        state: State code (e.g., 'LA') for state tax, None for federal
+
+    Returns:
+        Tuple of (min, max, rate) tuples
+    """
+    return _BRACKET_ROWS[_bracket_key(filing_status, state)]
+
+
+def compute_tax(income, filing_status, state=None):
+    """
+    Compute bracket tax for one or many taxable incomes.
+
+    The bracket is located with a binary search (bisect for a scalar,
+    np.digitize for arrays) and the tax is the cumulative tax at the
+    bracket floor plus the marginal amount.
+
+    Args:
+        income: Taxable income (scalar or array-like)
+        filing_status: 'single', 'married_filing_jointly', etc.
+        state: State code (e.g., 'LA') for state tax, None for federal
+
+    Returns:
+        Tax owed (float for scalar input, ndarray otherwise)
+    """
+    key = _bracket_key(filing_status, state)
+    if np.ndim(income) == 0:
+        thresholds, rates, cumulative_tax = _BRACKET_LISTS[key]
+        income = max(float(income), 0.0)
+        idx = bisect_right(thresholds, income) - 1
+        return cumulative_tax[idx] + (income - thresholds[idx]) * rates[idx]
+
+    thresholds, rates, cumulative_tax, _ = _BRACKETS[key]
+    income = np.maximum(np.asarray(income, dtype=np.float64), 0.0)
+    idx = np.digitize(income, thresholds[1:])
+    return cumulative_tax[idx] + (income - thresholds[idx]) * rates[idx]
+
+
+def bracket_amounts(income, filing_status, state=None):
+    """
+    Split a taxable income into the amount falling in each bracket.
+
+    Args:
+        income: Taxable income
+        filing_status: 'single', 'married_filing_jointly', etc.
+        state: State code (e.g., 'LA') for state tax, None for federal
+
+    Returns:
+        ndarray with the taxable amount in each bracket (0.0 above the income)
+    """
+    thresholds, _, _, widths = _BRACKETS[_bracket_key(filing_status, state)]
+    return np.clip(float(income) - thresholds, 0.0, widths)
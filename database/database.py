@@ -2,30 +2,93 @@
 Database connection and session management.
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, scoped_session
-from config.settings import DATABASE_URL
-from database.models import Base
+import atexit
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from sqlalchemy import Integer, case, cast, create_engine, delete, event, extract, func, insert, inspect, literal, select, update
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session, sessionmaker, scoped_session
+from sqlalchemy.pool import StaticPool
+from config.settings import get_settings, ensure_dirs
+from database.models import AGGREGATE_BASIS_DATES, Base, Entity, Transaction, TransactionAggregate
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Session seeded by session_scope(); returned by get_session() while set
+_current_session: ContextVar[Optional[Session]] = ContextVar('_current_session', default=None)
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Use WAL journaling with relaxed fsync and memory-mapped reads for SQLite."""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    cursor.close()
+
+
+# Enum-backed columns that older versions filled with member names
+# ('INCOME', 'FARM', 'CASH') instead of the lowercase stored values
+_CHOICE_COLUMNS = (
+    Transaction.__table__.c.transaction_type,
+    Entity.__table__.c.entity_type,
+    Entity.__table__.c.accounting_method,
+)
+
+
+def _normalize_choice_columns(connection):
+    """Lowercase enum-backed columns in existing tables; a no-op once they are."""
+    tables = set(inspect(connection).get_table_names())
+    for column in _CHOICE_COLUMNS:
+        if column.table.name in tables:
+            connection.execute(
+                update(column.table)
+                .where(column != func.lower(column))
+                .values({column.name: func.lower(column)})
+            )
+
+
+def _aggregates_missing(connection):
+    """Check whether the aggregates table is empty while aggregated transactions exist."""
+    if connection.execute(select(TransactionAggregate.entity_id).limit(1)).first() is not None:
+        return False
+    source = select(Transaction.id).where(Transaction.is_capital_expense == False).limit(1)
+    return connection.execute(source).first() is not None
+
 
 class Database:
     """Database connection manager."""
 
     def __init__(self, database_url=None):
         """Initialize database connection."""
-        self.database_url = database_url or DATABASE_URL
+        self.database_url = database_url
         self.engine = None
         self.session_factory = None
         self.Session = None
 
     def connect(self):
         """Create database engine and session factory."""
+        if self.database_url is None:
+            self.database_url = get_settings().DATABASE_URL
+
         try:
-            self.engine = create_engine(self.database_url, echo=False)
-            self.session_factory = sessionmaker(bind=self.engine)
+            if make_url(self.database_url).drivername.startswith('sqlite'):
+                self.engine = create_engine(
+                    self.database_url,
+                    echo=False,
+                    connect_args={'check_same_thread': False},
+                    poolclass=StaticPool
+                )
+                event.listen(self.engine, 'connect', _set_sqlite_pragmas)
+            else:
+                self.engine = create_engine(self.database_url, echo=False)
+            # Objects keep their loaded state across commits; managers commit
+            # per operation and shouldn't trigger a reload on the next read
+            self.session_factory = sessionmaker(bind=self.engine, expire_on_commit=False)
             self.Session = scoped_session(self.session_factory)
             logger.info(f"Database connected: {self.database_url}")
             return True
@@ -34,9 +97,25 @@ class Database:
             return False
 
     def create_tables(self):
-        """Create all tables in the database."""
+        """
+        Create all tables in the database.
+
+        Enum-backed columns written with member names by older versions are
+        lowercased first, and indexes missing from existing tables are added. When the transaction aggregates table is empty but
+        transactions exist (it was just added, or an earlier fill failed), it
+        is filled from them. Everything runs in one transaction, so a failed
+        fill leaves no half-initialized aggregates table behind.
+        """
         try:
-            Base.metadata.create_all(self.engine)
+            with self.engine.begin() as conn:
+                _normalize_choice_columns(conn)
+                Base.metadata.create_all(conn)
+                # create_all skips existing tables, and their indexes with them
+                for table in Base.metadata.sorted_tables:
+                    for index in table.indexes:
+                        index.create(conn, checkfirst=True)
+                if _aggregates_missing(conn):
+                    rebuild_transaction_aggregates(conn)
             logger.info("Database tables created successfully")
             return True
         except Exception as e:
@@ -72,13 +151,128 @@ class Database:
 db = Database()
 
 
+@atexit.register
+def _dispose_engine():
+    """Release pooled connections when the process exits."""
+    if db.engine:
+        db.engine.dispose()
+
+
 def init_database():
     """Initialize database with tables."""
-    db.connect()
-    db.create_tables()
+    ensure_dirs()
+    if not db.connect() or not db.create_tables():
+        raise RuntimeError("Database initialization failed; see the log for details")
     return db
 
 
 def get_session():
-    """Get a database session."""
-    return db.get_session()
+    """
+    Get a database session.
+
+    Inside a session_scope() block this returns the scope's session
+    without going through the scoped_session registry.
+    """
+    return _current_session.get() or db.get_session()
+
+
+@contextmanager
+def session_scope():
+    """
+    Provide one session for a block of work.
+
+    All get_session() calls inside the block return the same session. It
+    is committed when the block exits normally, rolled back on error, and
+    closed either way. A nested scope joins the enclosing one and leaves
+    committing and closing to it.
+
+    Yields:
+        Session object
+    """
+    current = _current_session.get()
+    if current is not None:
+        yield current
+        return
+    if not db.session_factory:
+        db.connect()
+    session = db.session_factory()
+    token = _current_session.set(session)
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        _current_session.reset(token)
+        session.close()
+
+
+def bulk_insert(model, rows):
+    """
+    Insert many rows for a model on the current session.
+
+    Uses a Core INSERT executed with a list of parameter dicts, which
+    SQLAlchemy batches into multi-row statements (insertmanyvalues). The
+    rows join the caller's transaction; committing is left to the caller
+    (session_scope() commits when its block exits).
+
+    Args:
+        model: Mapped model class (e.g., Transaction). Transaction inserts
+            also rebuild the affected entities' aggregates.
+        rows: List of column-name -> value dictionaries
+
+    Returns:
+        Number of rows inserted
+    """
+    if not rows:
+        return 0
+    session = get_session()
+    session.execute(insert(model), rows)
+    if model is Transaction:
+        for entity_id in {row['entity_id'] for row in rows}:
+            rebuild_transaction_aggregates(session, entity_id)
+    logger.info(f"Bulk inserted {len(rows)} {model.__tablename__} rows")
+    return len(rows)
+
+
+def rebuild_transaction_aggregates(connection, entity_id=None):
+    """
+    Recompute transaction aggregates from the transactions table.
+
+    Used to fill the table the first time it is created and after writes
+    that bypass TransactionManager.
+
+    Args:
+        connection: Connection or Session to run the statements on
+        entity_id: Only rebuild this entity's rows (default: all entities)
+    """
+    clear = delete(TransactionAggregate)
+    if entity_id is not None:
+        clear = clear.where(TransactionAggregate.entity_id == entity_id)
+    connection.execute(clear)
+
+    columns = ['entity_id', 'basis', 'year', 'transaction_type', 'category',
+               'total_amount', 'prepaid_total', 'transaction_count', 'first_transaction_id']
+    for basis, date_name in AGGREGATE_BASIS_DATES.items():
+        date_field = getattr(Transaction, date_name)
+        year = cast(extract('year', date_field), Integer)
+        grouped = select(
+            Transaction.entity_id,
+            literal(basis),
+            year,
+            Transaction.transaction_type,
+            Transaction.category,
+            func.sum(Transaction.amount),
+            func.sum(case((Transaction.is_prepaid_expense == True, Transaction.amount), else_=0)),
+            func.count(),
+            func.min(Transaction.id)
+        ).where(
+            Transaction.is_capital_expense == False,
+            date_field.is_not(None)
+        ).group_by(
+            Transaction.entity_id, year, Transaction.transaction_type, Transaction.category
+        )
+        if entity_id is not None:
+            grouped = grouped.where(Transaction.entity_id == entity_id)
+        connection.execute(insert(TransactionAggregate).from_select(columns, grouped))
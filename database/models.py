@@ -3,13 +3,39 @@ Database models for the tax assistant application.
 Handles entities, assets, transactions, and depreciation tracking.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Date, DateTime, ForeignKey, Boolean, Text, Enum
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from datetime import date, datetime
+from typing import List, Optional
+from sqlalchemy import TypeDecorator, Integer, String, Float, Numeric, Date, DateTime, ForeignKey, Boolean, Text, Index, CheckConstraint
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+from sqlalchemy.sql import func, text
 import enum
+import sys
 
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Declarative base for all models."""
+    pass
+
+
+# Monetary amounts: exact fixed-point storage, plain float in Python so
+# calculators keep working with native arithmetic.
+Money = Numeric(14, 2, asdecimal=False)
+
+
+class InternedStr(TypeDecorator):
+    """
+    String column whose loaded values are interned.
+
+    Used for low-cardinality text such as transaction categories, so rows
+    loaded from the database share one str object per distinct value.
+    """
+    impl = String
+    cache_ok = True
+
+    def process_result_value(self, value, dialect):
+        if value is None:
+            return None
+        return sys.intern(value)
 
 
 class EntityType(enum.Enum):
@@ -33,70 +59,118 @@ class TransactionType(enum.Enum):
     EXPENSE = "expense"
 
 
+# Enum-backed columns store the plain string value; these sets are used for
+# validation in application code and for the table CHECK constraints.
+ENTITY_TYPES = frozenset(e.value for e in EntityType)
+ACCOUNTING_METHODS = frozenset(e.value for e in AccountingMethod)
+TX_TYPES = frozenset(e.value for e in TransactionType)
+
+# Date column that places a transaction in a year, per aggregate basis;
+# 'transaction' covers entities on neither cash nor accrual accounting
+AGGREGATE_BASIS_DATES = {
+    'cash': 'cash_date',
+    'accrual': 'accrual_date',
+    'transaction': 'transaction_date',
+}
+
+
+def _in_check(column, choices):
+    """Build a CHECK constraint restricting a column to a set of values."""
+    values = ", ".join(f"'{v}'" for v in sorted(choices))
+    return CheckConstraint(f"{column} IN ({values})", name=f"ck_{column}")
+
+
+def normalize_choice(value, choices):
+    """
+    Normalize an enum member or string to its stored value.
+
+    Args:
+        value: Enum member, value string or name string (case-insensitive)
+        choices: Set of valid stored values
+
+    Returns:
+        Stored string value
+    """
+    if isinstance(value, enum.Enum):
+        value = value.value
+    # Stored values are lowercase; an exact match needs no lower() copy
+    if value in choices:
+        return value
+    normalized = value.lower()
+    if normalized not in choices:
+        raise ValueError(f"Invalid value '{value}', expected one of: {', '.join(sorted(choices))}")
+    return normalized
+
+
 class Entity(Base):
     """Business entities (farm, holding companies, etc.)."""
     __tablename__ = 'entities'
-
-    id = Column(Integer, primary_key=True)
-    name = Column(String(200), nullable=False, unique=True)
-    entity_type = Column(Enum(EntityType), nullable=False)
-    accounting_method = Column(Enum(AccountingMethod), nullable=False, default=AccountingMethod.CASH)
-    ein = Column(String(20))  # Employer Identification Number
-    formation_date = Column(Date)
-    state = Column(String(2), default='LA')
-    notes = Column(Text)
-    active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    __table_args__ = (
+        _in_check('entity_type', ENTITY_TYPES),
+        _in_check('accounting_method', ACCOUNTING_METHODS),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False, unique=True)
+    entity_type: Mapped[str] = mapped_column(String(20), nullable=False)
+    accounting_method: Mapped[str] = mapped_column(String(8), nullable=False, default=AccountingMethod.CASH.value)
+    ein: Mapped[Optional[str]] = mapped_column(String(20))  # Employer Identification Number
+    formation_date: Mapped[Optional[date]] = mapped_column(Date)
+    state: Mapped[Optional[str]] = mapped_column(String(2), default='LA')
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now(), onupdate=func.now())
 
     # Relationships
-    assets = relationship("Asset", back_populates="entity", cascade="all, delete-orphan")
-    transactions = relationship("Transaction", back_populates="entity", cascade="all, delete-orphan")
+    assets: Mapped[List["Asset"]] = relationship("Asset", back_populates="entity", cascade="all, delete-orphan")
+    transactions: Mapped[List["Transaction"]] = relationship("Transaction", back_populates="entity", cascade="all, delete-orphan")
+    transaction_aggregates: Mapped[List["TransactionAggregate"]] = relationship("TransactionAggregate", cascade="all, delete-orphan")
 
     def __repr__(self):
-        return f"<Entity(name='{self.name}', type='{self.entity_type.value}')>"
+        return f"<Entity(name='{self.name}', type='{self.entity_type}')>"
 
 
 class Asset(Base):
     """Assets owned by entities (equipment, buildings, etc.)."""
     __tablename__ = 'assets'
 
-    id = Column(Integer, primary_key=True)
-    entity_id = Column(Integer, ForeignKey('entities.id'), nullable=False)
-    description = Column(String(500), nullable=False)
-    asset_type = Column(String(100))  # Equipment, Building, Land Improvement, etc.
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey('entities.id'), nullable=False, index=True)
+    description: Mapped[str] = mapped_column(String(500), nullable=False)
+    asset_type: Mapped[Optional[str]] = mapped_column(String(100))  # Equipment, Building, Land Improvement, etc.
 
     # Purchase information
-    purchase_date = Column(Date, nullable=False)
-    purchase_price = Column(Float, nullable=False)
-    salvage_value = Column(Float, default=0.0)
+    purchase_date: Mapped[date] = mapped_column(Date, nullable=False)
+    purchase_price: Mapped[float] = mapped_column(Money, nullable=False)
+    salvage_value: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Depreciation classification
-    macrs_class = Column(String(20))  # 3-year, 5-year, 7-year, etc.
-    recovery_period = Column(Integer)  # In years
-    depreciation_method = Column(String(20))  # MACRS, SL, DDB, Section 179, Bonus
+    macrs_class: Mapped[Optional[str]] = mapped_column(String(20))  # 3-year, 5-year, 7-year, etc.
+    recovery_period: Mapped[Optional[int]] = mapped_column(Integer)  # In years
+    depreciation_method: Mapped[Optional[str]] = mapped_column(String(20))  # MACRS, SL, DDB, Section 179, Bonus
 
     # Section 179 and Bonus Depreciation
-    section_179_amount = Column(Float, default=0.0)
-    bonus_depreciation_amount = Column(Float, default=0.0)
+    section_179_amount: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    bonus_depreciation_amount: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Current status
-    in_service_date = Column(Date)
-    disposal_date = Column(Date)
-    disposal_proceeds = Column(Float)
+    in_service_date: Mapped[Optional[date]] = mapped_column(Date)
+    disposal_date: Mapped[Optional[date]] = mapped_column(Date)
+    disposal_proceeds: Mapped[Optional[float]] = mapped_column(Money)
 
     # Tracking
-    accumulated_depreciation = Column(Float, default=0.0)
-    current_book_value = Column(Float)
+    accumulated_depreciation: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    current_book_value: Mapped[Optional[float]] = mapped_column(Money)
 
-    notes = Column(Text)
-    active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    active: Mapped[Optional[bool]] = mapped_column(Boolean, default=True)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now(), onupdate=func.now())
 
     # Relationships
-    entity = relationship("Entity", back_populates="assets")
-    depreciation_schedules = relationship("DepreciationSchedule", back_populates="asset", cascade="all, delete-orphan")
+    entity: Mapped["Entity"] = relationship("Entity", back_populates="assets")
+    depreciation_schedules: Mapped[List["DepreciationSchedule"]] = relationship("DepreciationSchedule", back_populates="asset", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Asset(description='{self.description}', entity='{self.entity.name if self.entity else None}')>"
@@ -105,29 +179,33 @@ class Asset(Base):
 class DepreciationSchedule(Base):
     """Annual depreciation schedule for each asset."""
     __tablename__ = 'depreciation_schedules'
+    __table_args__ = (
+        # One schedule per asset per year; also serves asset_id lookups
+        Index('ix_dep_asset_year', 'asset_id', 'tax_year', unique=True),
+    )
 
-    id = Column(Integer, primary_key=True)
-    asset_id = Column(Integer, ForeignKey('assets.id'), nullable=False)
-    tax_year = Column(Integer, nullable=False)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    asset_id: Mapped[int] = mapped_column(Integer, ForeignKey('assets.id'), nullable=False)
+    tax_year: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
 
     # Depreciation amounts
-    section_179_deduction = Column(Float, default=0.0)
-    bonus_depreciation = Column(Float, default=0.0)
-    macrs_depreciation = Column(Float, default=0.0)
-    total_depreciation = Column(Float, default=0.0)
+    section_179_deduction: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    bonus_depreciation: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    macrs_depreciation: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    total_depreciation: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Book values
-    beginning_book_value = Column(Float)
-    ending_book_value = Column(Float)
+    beginning_book_value: Mapped[Optional[float]] = mapped_column(Money)
+    ending_book_value: Mapped[Optional[float]] = mapped_column(Money)
 
     # Status
-    is_final_year = Column(Boolean, default=False)
+    is_final_year: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now(), onupdate=func.now())
 
     # Relationships
-    asset = relationship("Asset", back_populates="depreciation_schedules")
+    asset: Mapped["Asset"] = relationship("Asset", back_populates="depreciation_schedules")
 
     def __repr__(self):
         return f"<DepreciationSchedule(asset_id={self.asset_id}, year={self.tax_year}, total=${self.total_depreciation:,.2f})>"
@@ -136,88 +214,134 @@ class DepreciationSchedule(Base):
 class Transaction(Base):
     """Income and expense transactions."""
     __tablename__ = 'transactions'
-
-    id = Column(Integer, primary_key=True)
-    entity_id = Column(Integer, ForeignKey('entities.id'), nullable=False)
+    __table_args__ = (
+        # Per-entity income/expense rows over a cash- or accrual-basis date
+        # range. Every such query excludes capital expenses, so the indexes
+        # are partial and never hold capital rows.
+        Index('ix_tx_entity_type_cash_date', 'entity_id', 'transaction_type', 'cash_date',
+              sqlite_where=text('is_capital_expense = 0'),
+              postgresql_where=text('is_capital_expense = false')),
+        Index('ix_tx_entity_type_accrual_date', 'entity_id', 'transaction_type', 'accrual_date',
+              sqlite_where=text('is_capital_expense = 0'),
+              postgresql_where=text('is_capital_expense = false')),
+        _in_check('transaction_type', TX_TYPES),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey('entities.id'), nullable=False, index=True)
 
     # Transaction details
-    transaction_date = Column(Date, nullable=False)
-    transaction_type = Column(Enum(TransactionType), nullable=False)
-    category = Column(String(100), nullable=False)  # grain_sales, fertilizer, etc.
+    transaction_date: Mapped[date] = mapped_column(Date, nullable=False, index=True)
+    transaction_type: Mapped[str] = mapped_column(String(8), nullable=False)
+    category: Mapped[str] = mapped_column(InternedStr(100), nullable=False, index=True)  # grain_sales, fertilizer, etc.
 
     # Amounts
-    amount = Column(Float, nullable=False)
+    amount: Mapped[float] = mapped_column(Money, nullable=False)
 
     # Description
-    description = Column(Text)
-    reference_number = Column(String(100))  # Check number, invoice number, etc.
+    description: Mapped[Optional[str]] = mapped_column(Text)
+    reference_number: Mapped[Optional[str]] = mapped_column(String(100))  # Check number, invoice number, etc.
 
     # Tax treatment
-    is_prepaid_expense = Column(Boolean, default=False)
-    is_capital_expense = Column(Boolean, default=False)
-    tax_year = Column(Integer)  # Year this transaction applies to for tax purposes
+    is_prepaid_expense: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    is_capital_expense: Mapped[Optional[bool]] = mapped_column(Boolean, default=False)
+    tax_year: Mapped[Optional[int]] = mapped_column(Integer, index=True)  # Year this transaction applies to for tax purposes
 
     # Cash vs Accrual
-    cash_date = Column(Date)  # When cash was received/paid
-    accrual_date = Column(Date)  # When income was earned/expense was incurred
+    cash_date: Mapped[Optional[date]] = mapped_column(Date)  # When cash was received/paid
+    accrual_date: Mapped[Optional[date]] = mapped_column(Date)  # When income was earned/expense was incurred
 
-    notes = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    notes: Mapped[Optional[str]] = mapped_column(Text)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now(), onupdate=func.now())
 
     # Relationships
-    entity = relationship("Entity", back_populates="transactions")
+    entity: Mapped["Entity"] = relationship("Entity", back_populates="transactions")
+
+    def __repr__(self):
+        return f"<Transaction(date={self.transaction_date}, type={self.transaction_type}, amount=${self.amount:,.2f})>"
+
+
+class TransactionAggregate(Base):
+    """
+    Running non-capital transaction totals by entity, year and category.
+
+    Kept in step with the transactions table by TransactionManager writes,
+    so tax-year summaries read one row per category. Each transaction is
+    counted once per basis in AGGREGATE_BASIS_DATES, in the year of that
+    basis's date.
+    """
+    __tablename__ = 'transaction_aggregates'
+    __table_args__ = (
+        _in_check('basis', AGGREGATE_BASIS_DATES),
+        _in_check('transaction_type', TX_TYPES),
+    )
+
+    entity_id: Mapped[int] = mapped_column(Integer, ForeignKey('entities.id'), primary_key=True)
+    basis: Mapped[str] = mapped_column(String(11), primary_key=True)
+    year: Mapped[int] = mapped_column(Integer, primary_key=True)
+    transaction_type: Mapped[str] = mapped_column(String(8), primary_key=True)
+    category: Mapped[str] = mapped_column(InternedStr(100), primary_key=True)
+
+    total_amount: Mapped[float] = mapped_column(Money, nullable=False, default=0.0)
+    prepaid_total: Mapped[float] = mapped_column(Money, nullable=False, default=0.0)
+    transaction_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    # Lowest transaction id in the group; summaries list categories in
+    # order of their first transaction
+    first_transaction_id: Mapped[int] = mapped_column(Integer, nullable=False)
 
     def __repr__(self):
-        return f"<Transaction(date={self.transaction_date}, type={self.transaction_type.value}, amount=${self.amount:,.2f})>"
+        return (f"<TransactionAggregate({self.basis} {self.year}, {self.transaction_type} "
+                f"{self.category}, total=${self.total_amount:,.2f})>")
 
 
 class TaxCalculation(Base):
     """Stored tax calculations and scenarios."""
     __tablename__ = 'tax_calculations'
 
-    id = Column(Integer, primary_key=True)
-    tax_year = Column(Integer, nullable=False)
-    scenario_name = Column(String(200), default="Default")
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    tax_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    scenario_name: Mapped[Optional[str]] = mapped_column(String(200), default="Default")
 
     # Entity (None = consolidated)
-    entity_id = Column(Integer, ForeignKey('entities.id'))
+    entity_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('entities.id'))
 
     # Income
-    total_income = Column(Float, default=0.0)
-    farm_income = Column(Float, default=0.0)
+    total_income: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    farm_income: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Expenses
-    total_expenses = Column(Float, default=0.0)
-    depreciation = Column(Float, default=0.0)
-    section_179 = Column(Float, default=0.0)
+    total_expenses: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    depreciation: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    section_179: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Net
-    net_farm_profit = Column(Float, default=0.0)
+    net_farm_profit: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Self-Employment Tax
-    se_tax = Column(Float, default=0.0)
+    se_tax: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Federal Income Tax
-    federal_taxable_income = Column(Float, default=0.0)
-    federal_tax = Column(Float, default=0.0)
+    federal_taxable_income: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    federal_tax: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Louisiana State Tax
-    la_taxable_income = Column(Float, default=0.0)
-    la_state_tax = Column(Float, default=0.0)
+    la_taxable_income: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
+    la_state_tax: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Total Tax Liability
-    total_tax_liability = Column(Float, default=0.0)
+    total_tax_liability: Mapped[Optional[float]] = mapped_column(Money, default=0.0)
 
     # Effective Rates
-    effective_federal_rate = Column(Float, default=0.0)
-    effective_total_rate = Column(Float, default=0.0)
+    effective_federal_rate: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
+    effective_total_rate: Mapped[Optional[float]] = mapped_column(Float, default=0.0)
 
     # Metadata
-    calculation_date = Column(DateTime, default=datetime.utcnow)
-    notes = Column(Text)
+    calculation_date: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
+    notes: Mapped[Optional[str]] = mapped_column(Text)
 
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
 
     def __repr__(self):
         return f"<TaxCalculation(year={self.tax_year}, scenario='{self.scenario_name}', total_tax=${self.total_tax_liability:,.2f})>"
@@ -227,20 +351,20 @@ class TaxScenario(Base):
     """Tax planning scenarios with different assumptions."""
     __tablename__ = 'tax_scenarios'
 
-    id = Column(Integer, primary_key=True)
-    name = Column(String(200), nullable=False)
-    tax_year = Column(Integer, nullable=False)
-    description = Column(Text)
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    name: Mapped[str] = mapped_column(String(200), nullable=False)
+    tax_year: Mapped[int] = mapped_column(Integer, nullable=False)
+    description: Mapped[Optional[str]] = mapped_column(Text)
 
     # Scenario parameters (stored as JSON-like text)
     # Could include: income timing, section 179 elections, prepaid expenses, etc.
-    parameters = Column(Text)
+    parameters: Mapped[Optional[str]] = mapped_column(Text)
 
     # Results reference
-    calculation_id = Column(Integer, ForeignKey('tax_calculations.id'))
+    calculation_id: Mapped[Optional[int]] = mapped_column(Integer, ForeignKey('tax_calculations.id'))
 
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now())
+    updated_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=False), default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return f"<TaxScenario(name='{self.name}', year={self.tax_year})>"
@@ -4,46 +4,100 @@ Provides CLI interface for managing farm tax operations.
 """
 
 import click
+import csv
 from rich.console import Console
-from rich.table import Table
-from datetime import datetime, date
+from datetime import date
 import logging
+from logging.handlers import MemoryHandler
+import re
+import shlex
 import sys
 
-# Setup logging
+# Setup logging. File writes are buffered and flushed on ERROR, when the
+# buffer fills, and at interpreter exit (logging.shutdown closes handlers).
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+_file_handler = logging.FileHandler('tax_assistant.log')
+_file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+_stream_handler = logging.StreamHandler(sys.stdout)
 logging.basicConfig(
     level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+    format=LOG_FORMAT,
     handlers=[
-        logging.FileHandler('tax_assistant.log'),
-        logging.StreamHandler(sys.stdout)
+        MemoryHandler(capacity=1024, flushLevel=logging.ERROR, target=_file_handler),
+        _stream_handler
     ]
 )
 
 logger = logging.getLogger(__name__)
 console = Console()
 
+# Bound formatter for the summary columns, e.g. "$     285,000.00"
+_MONEY = "${:>15,.2f}".format
 
-# Import modules
-from database.database import init_database, db
-from modules.entities.entity_manager import EntityManager
-from modules.assets.asset_manager import AssetManager
-from modules.transactions.transaction_manager import TransactionManager
-from modules.tax_calc.louisiana_tax import CombinedTaxCalculator
-from modules.reports.report_generator import ReportGenerator
+_ISO_DATE = re.compile(r'\d{4}-\d{2}-\d{2}$')
+
+
+def parse_date(value):
+    """Parse a YYYY-MM-DD date string."""
+    if not _ISO_DATE.match(value):
+        raise ValueError(f"Invalid date '{value}', expected YYYY-MM-DD")
+    return date.fromisoformat(value)
+
+
+# Tables longer than this are written as plain aligned text; Rich layout
+# cost grows quickly with row count.
+MAX_RICH_ROWS = 500
+
+
+def print_table(title, columns, rows):
+    """
+    Print rows as a Rich table, or as plain text for large row counts.
+
+    Args:
+        title: Table title
+        columns: List of (header, style) tuples
+        rows: List of row tuples of strings
+    """
+    if len(rows) > MAX_RICH_ROWS:
+        headers = [header for header, _ in columns]
+        widths = [max(len(header), *(len(row[i]) for row in rows)) for i, header in enumerate(headers)]
+        line_format = "  ".join(f"{{:<{w}}}" for w in widths)
+        out = sys.stdout
+        out.write(f"{title}\n")
+        out.write(line_format.format(*headers).rstrip() + "\n")
+        for row in rows:
+            out.write(line_format.format(*row).rstrip() + "\n")
+        return
+
+    from rich.table import Table
+
+    table = Table(title=title)
+    for header, style in columns:
+        table.add_column(header, style=style)
+    for row in rows:
+        table.add_row(*row)
+    console.print(table)
+
+
+# Database, manager and calculator modules are imported inside the commands
+# that use them, so simple commands don't pay for SQLAlchemy/NumPy at startup.
 from config.settings import DEFAULT_TAX_YEAR
 
 
 @click.group()
-def cli():
+@click.option('--quiet', is_flag=True, help='Do not echo log messages to the console')
+def cli(quiet):
     """Tax Assistant for Farming Operations - Manage entities, assets, transactions, and tax calculations."""
-    pass
+    if quiet:
+        logging.getLogger().removeHandler(_stream_handler)
 
 
 @cli.command()
 def init_db():
     """Initialize the database."""
     try:
+        from database.database import init_database
+
         init_database()
         console.print("[green]✓ Database initialized successfully![/green]")
     except Exception as e:
@@ -70,16 +124,19 @@ def entity():
 def entity_add(name, entity_type, accounting, ein, state):
     """Add a new entity."""
     try:
-        em = EntityManager()
-        entity = em.create_entity(
-            name=name,
-            entity_type=entity_type,
-            accounting_method=accounting,
-            ein=ein,
-            state=state
-        )
-        console.print(f"[green]✓ Created entity: {entity.name} (ID: {entity.id})[/green]")
-        em.close()
+        from database.database import session_scope
+        from modules.entities.entity_manager import EntityManager
+
+        with session_scope() as session:
+            em = EntityManager(session)
+            entity = em.create_entity(
+                name=name,
+                entity_type=entity_type,
+                accounting_method=accounting,
+                ein=ein,
+                state=state
+            )
+            console.print(f"[green]✓ Created entity: {entity.name} (ID: {entity.id})[/green]")
     except Exception as e:
         console.print(f"[red]✗ Failed to create entity: {e}[/red]")
 
@@ -88,30 +145,32 @@ def entity_add(name, entity_type, accounting, ein, state):
 def entity_list():
     """List all entities."""
     try:
-        em = EntityManager()
-        entities = em.get_all_entities()
-
-        table = Table(title="Business Entities")
-        table.add_column("ID", style="cyan")
-        table.add_column("Name", style="green")
-        table.add_column("Type", style="yellow")
-        table.add_column("Accounting", style="blue")
-        table.add_column("Assets", style="magenta")
-        table.add_column("Transactions", style="magenta")
-
-        for entity in entities:
-            summary = em.get_entity_summary(entity.id)
-            table.add_row(
-                str(entity.id),
-                entity.name,
-                entity.entity_type.value,
-                entity.accounting_method.value,
-                str(summary['asset_count']),
-                str(summary['transaction_count'])
-            )
-
-        console.print(table)
-        em.close()
+        from database.database import session_scope
+        from modules.entities.entity_manager import EntityManager
+
+        with session_scope() as session:
+            em = EntityManager(session)
+            summaries = em.get_all_entities_with_summary()
+
+            rows = [
+                (
+                    str(summary['id']),
+                    summary['name'],
+                    summary['type'],
+                    summary['accounting_method'],
+                    str(summary['asset_count']),
+                    str(summary['transaction_count'])
+                )
+                for summary in summaries
+            ]
+            print_table("Business Entities", [
+                ("ID", "cyan"),
+                ("Name", "green"),
+                ("Type", "yellow"),
+                ("Accounting", "blue"),
+                ("Assets", "magenta"),
+                ("Transactions", "magenta"),
+            ], rows)
     except Exception as e:
         console.print(f"[red]✗ Failed to list entities: {e}[/red]")
 
@@ -134,59 +193,100 @@ def asset():
 def asset_add(entity_id, description, cost, purchase_date, macrs_class, asset_type, section_179, bonus):
     """Add a new asset."""
     try:
-        am = AssetManager()
-        purchase_date_obj = datetime.strptime(purchase_date, '%Y-%m-%d').date()
-
-        asset = am.add_asset(
-            entity_id=entity_id,
-            description=description,
-            purchase_price=cost,
-            purchase_date=purchase_date_obj,
-            macrs_class=macrs_class,
-            asset_type=asset_type,
-            use_section_179=section_179,
-            use_bonus=bonus
-        )
-
-        console.print(f"[green]✓ Added asset: {asset.description} (ID: {asset.id})[/green]")
-        console.print(f"  First year depreciation: ${asset.accumulated_depreciation:,.2f}")
-        am.close()
+        from database.database import session_scope
+        from modules.assets.asset_manager import AssetManager
+
+        with session_scope() as session:
+            am = AssetManager(session)
+            purchase_date_obj = parse_date(purchase_date)
+
+            asset = am.add_asset(
+                entity_id=entity_id,
+                description=description,
+                purchase_price=cost,
+                purchase_date=purchase_date_obj,
+                macrs_class=macrs_class,
+                asset_type=asset_type,
+                use_section_179=section_179,
+                use_bonus=bonus
+            )
+
+            console.print(f"[green]✓ Added asset: {asset.description} (ID: {asset.id})[/green]")
+            console.print(f"  First year depreciation: ${asset.accumulated_depreciation:,.2f}")
     except Exception as e:
         console.print(f"[red]✗ Failed to add asset: {e}[/red]")
 
 
+@asset.command('import')
+@click.option('--csv', 'csv_path', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='CSV with entity_id, description, cost, purchase_date, macrs_class '
+                   '[, asset_type, section_179, bonus] columns')
+def asset_import(csv_path):
+    """Import assets from a CSV file in one transaction."""
+    try:
+        from database.database import session_scope
+        from modules.assets.asset_manager import AssetManager
+
+        rows = []
+        with open(csv_path, newline='') as f:
+            for record in csv.DictReader(f):
+                rows.append({
+                    'entity_id': int(record['entity_id']),
+                    'description': record['description'],
+                    'purchase_price': float(record['cost']),
+                    'purchase_date': parse_date(record['purchase_date']),
+                    'macrs_class': record['macrs_class'],
+                    'asset_type': record.get('asset_type') or 'Equipment',
+                    'use_section_179': (record.get('section_179') or 'true').lower() in ('true', '1', 'yes'),
+                    'use_bonus': (record.get('bonus') or 'true').lower() in ('true', '1', 'yes')
+                })
+
+        with session_scope() as session:
+            am = AssetManager(session)
+            assets = am.add_assets_bulk(rows)
+            total_depreciation = sum(a.accumulated_depreciation for a in assets)
+
+            console.print(f"[green]✓ Imported {len(assets)} assets[/green]")
+            console.print(f"  First year depreciation: ${total_depreciation:,.2f}")
+    except Exception as e:
+        console.print(f"[red]✗ Failed to import assets: {e}[/red]")
+
+
 @asset.command('list')
 @click.option('--entity-id', type=int, help='Filter by entity ID')
 def asset_list(entity_id):
     """List assets."""
     try:
-        am = AssetManager()
-
-        if entity_id:
-            assets = am.get_assets_by_entity(entity_id)
-        else:
-            assets = am.get_all_assets()
-
-        table = Table(title=f"Assets{f' for Entity {entity_id}' if entity_id else ''}")
-        table.add_column("ID", style="cyan")
-        table.add_column("Description", style="green")
-        table.add_column("MACRS Class", style="yellow")
-        table.add_column("Cost", style="blue")
-        table.add_column("Book Value", style="magenta")
-        table.add_column("Placed in Service", style="cyan")
-
-        for asset in assets:
-            table.add_row(
-                str(asset.id),
-                asset.description,
-                asset.macrs_class or '',
-                f"${asset.purchase_price:,.2f}",
-                f"${asset.current_book_value:,.2f}",
-                asset.in_service_date.strftime('%Y-%m-%d') if asset.in_service_date else ''
-            )
-
-        console.print(table)
-        am.close()
+        from database.database import session_scope
+        from modules.assets.asset_manager import AssetManager, ASSET_LIST_COLUMNS
+
+        with session_scope() as session:
+            am = AssetManager(session)
+
+            if entity_id:
+                assets = am.get_assets_by_entity(entity_id, columns=ASSET_LIST_COLUMNS)
+            else:
+                assets = am.get_all_assets(columns=ASSET_LIST_COLUMNS)
+
+            rows = [
+                (
+                    str(asset.id),
+                    asset.description,
+                    asset.macrs_class or '',
+                    f"${asset.purchase_price:,.2f}",
+                    f"${asset.current_book_value:,.2f}",
+                    asset.in_service_date.strftime('%Y-%m-%d') if asset.in_service_date else ''
+                )
+                for asset in assets
+            ]
+            print_table(f"Assets{f' for Entity {entity_id}' if entity_id else ''}", [
+                ("ID", "cyan"),
+                ("Description", "green"),
+                ("MACRS Class", "yellow"),
+                ("Cost", "blue"),
+                ("Book Value", "magenta"),
+                ("Placed in Service", "cyan"),
+            ], rows)
     except Exception as e:
         console.print(f"[red]✗ Failed to list assets: {e}[/red]")
 
@@ -208,55 +308,92 @@ def transaction():
 def transaction_add(entity_id, trans_date, trans_type, category, amount, description, prepaid):
     """Add a transaction."""
     try:
-        tm = TransactionManager()
-        trans_date_obj = datetime.strptime(trans_date, '%Y-%m-%d').date()
-
-        trans = tm.add_transaction(
-            entity_id=entity_id,
-            transaction_date=trans_date_obj,
-            transaction_type=trans_type,
-            category=category,
-            amount=amount,
-            description=description,
-            is_prepaid=prepaid
-        )
-
-        console.print(f"[green]✓ Added {trans_type}: ${amount:,.2f} - {category}[/green]")
-        tm.close()
+        from database.database import session_scope
+        from modules.transactions.transaction_manager import TransactionManager
+
+        with session_scope() as session:
+            tm = TransactionManager(session)
+            trans_date_obj = parse_date(trans_date)
+
+            trans = tm.add_transaction(
+                entity_id=entity_id,
+                transaction_date=trans_date_obj,
+                transaction_type=trans_type,
+                category=category,
+                amount=amount,
+                description=description,
+                is_prepaid=prepaid
+            )
+
+            console.print(f"[green]✓ Added {trans_type}: ${amount:,.2f} - {category}[/green]")
     except Exception as e:
         console.print(f"[red]✗ Failed to add transaction: {e}[/red]")
 
 
+@transaction.command('import')
+@click.option('--csv', 'csv_path', required=True, type=click.Path(exists=True, dir_okay=False),
+              help='CSV with entity_id, date, type, category, amount '
+                   '[, description, prepaid] columns')
+def transaction_import(csv_path):
+    """Import transactions from a CSV file in one transaction."""
+    try:
+        from database.database import session_scope
+        from modules.transactions.transaction_manager import TransactionManager
+
+        rows = []
+        with open(csv_path, newline='') as f:
+            for record in csv.DictReader(f):
+                rows.append({
+                    'entity_id': int(record['entity_id']),
+                    'transaction_date': parse_date(record['date']),
+                    'transaction_type': record['type'],
+                    'category': record['category'],
+                    'amount': float(record['amount']),
+                    'description': record.get('description') or None,
+                    'is_prepaid': (record.get('prepaid') or 'false').lower() in ('true', '1', 'yes')
+                })
+
+        with session_scope() as session:
+            tm = TransactionManager(session)
+            count = tm.add_transactions_bulk(rows)
+
+            console.print(f"[green]✓ Imported {count} transactions[/green]")
+    except Exception as e:
+        console.print(f"[red]✗ Failed to import transactions: {e}[/red]")
+
+
 @transaction.command('summary')
 @click.option('--entity-id', required=True, type=int, help='Entity ID')
 @click.option('--year', type=int, default=DEFAULT_TAX_YEAR, help='Tax year')
 def transaction_summary(entity_id, year):
     """Show transaction summary for a tax year."""
     try:
-        tm = TransactionManager()
+        from database.database import session_scope
+        from modules.transactions.transaction_manager import TransactionManager
 
-        income = tm.get_income_summary(entity_id, year)
-        expenses = tm.get_expense_summary(entity_id, year)
+        with session_scope() as session:
+            tm = TransactionManager(session)
 
-        console.print(f"\n[bold]Transaction Summary for Entity {entity_id} - Tax Year {year}[/bold]\n")
+            income = tm.get_income_summary(entity_id, year)
+            expenses = tm.get_expense_summary(entity_id, year)
 
-        # Income
-        console.print("[green]INCOME:[/green]")
-        for category, amount in income['by_category'].items():
-            console.print(f"  {category.replace('_', ' ').title():<40} ${amount:>15,.2f}")
-        console.print(f"  {'TOTAL INCOME':<40} ${income['total_income']:>15,.2f}\n")
+            console.print(f"\n[bold]Transaction Summary for Entity {entity_id} - Tax Year {year}[/bold]\n")
 
-        # Expenses
-        console.print("[red]EXPENSES:[/red]")
-        for category, amount in expenses['by_category'].items():
-            console.print(f"  {category.replace('_', ' ').title():<40} ${amount:>15,.2f}")
-        console.print(f"  {'TOTAL EXPENSES':<40} ${expenses['total_expenses']:>15,.2f}\n")
+            # Income
+            console.print("[green]INCOME:[/green]")
+            for category, amount in income['by_category'].items():
+                console.print(f"  {category.replace('_', ' ').title():<40} {_MONEY(amount)}")
+            console.print(f"  {'TOTAL INCOME':<40} {_MONEY(income['total_income'])}\n")
 
-        # Net
-        net = income['total_income'] - expenses['total_expenses']
-        console.print(f"  [bold]{'NET (before depreciation)':<40} ${net:>15,.2f}[/bold]")
+            # Expenses
+            console.print("[red]EXPENSES:[/red]")
+            for category, amount in expenses['by_category'].items():
+                console.print(f"  {category.replace('_', ' ').title():<40} {_MONEY(amount)}")
+            console.print(f"  {'TOTAL EXPENSES':<40} {_MONEY(expenses['total_expenses'])}\n")
 
-        tm.close()
+            # Net
+            net = income['total_income'] - expenses['total_expenses']
+            console.print(f"  [bold]{'NET (before depreciation)':<40} {_MONEY(net)}[/bold]")
     except Exception as e:
         console.print(f"[red]✗ Failed to get summary: {e}[/red]")
 
@@ -274,36 +411,39 @@ def tax():
 def tax_calculate(entity_id, year, filing_status):
     """Calculate taxes for an entity."""
     try:
-        # Get transaction summary
-        tm = TransactionManager()
-        income = tm.get_income_summary(entity_id, year)
-        expenses = tm.get_expense_summary(entity_id, year)
-
-        # Get depreciation
-        am = AssetManager()
-        depreciation_data = am.get_total_depreciation_for_entity(entity_id, year)
-
-        # Calculate tax
-        calc = CombinedTaxCalculator(filing_status=filing_status, tax_year=year)
-        tax_result = calc.calculate_combined_tax(
-            total_income=income['total_income'],
-            total_expenses=expenses['total_expenses'],
-            depreciation=depreciation_data['total_depreciation']
-        )
-
-        # Display results
-        console.print(f"\n[bold]Tax Calculation for Entity {entity_id} - {year}[/bold]\n")
-        console.print(f"Farm Income:          ${tax_result['farm_income']:>15,.2f}")
-        console.print(f"Farm Expenses:        ${tax_result['farm_expenses']:>15,.2f}")
-        console.print(f"Depreciation:         ${tax_result['depreciation']:>15,.2f}")
-        console.print(f"Net Farm Profit:      ${tax_result['net_farm_profit']:>15,.2f}")
-        console.print(f"\nFederal Tax:          ${tax_result['total_federal_tax']:>15,.2f}")
-        console.print(f"Louisiana Tax:        ${tax_result['total_louisiana_tax']:>15,.2f}")
-        console.print(f"[bold]TOTAL TAX:            ${tax_result['total_tax_liability']:>15,.2f}[/bold]")
-        console.print(f"Effective Rate:       {tax_result['combined_effective_rate_percent']:>16}")
-
-        tm.close()
-        am.close()
+        from database.database import session_scope
+        from modules.assets.asset_manager import AssetManager
+        from modules.transactions.transaction_manager import TransactionManager
+        from modules.tax_calc.louisiana_tax import get_combined_calculator
+
+        with session_scope() as session:
+            # Get transaction summary
+            tm = TransactionManager(session)
+            income = tm.get_income_summary(entity_id, year)
+            expenses = tm.get_expense_summary(entity_id, year)
+
+            # Get depreciation
+            am = AssetManager(session)
+            depreciation_data = am.get_total_depreciation_for_entity(entity_id, year)
+
+            # Calculate tax
+            calc = get_combined_calculator(filing_status, year)
+            tax_result = calc.calculate_combined_tax(
+                total_income=income['total_income'],
+                total_expenses=expenses['total_expenses'],
+                depreciation=depreciation_data['total_depreciation']
+            )
+
+            # Display results
+            console.print(f"\n[bold]Tax Calculation for Entity {entity_id} - {year}[/bold]\n")
+            console.print(f"Farm Income:          {_MONEY(tax_result['farm_income'])}")
+            console.print(f"Farm Expenses:        {_MONEY(tax_result['farm_expenses'])}")
+            console.print(f"Depreciation:         {_MONEY(tax_result['depreciation'])}")
+            console.print(f"Net Farm Profit:      {_MONEY(tax_result['net_farm_profit'])}")
+            console.print(f"\nFederal Tax:          {_MONEY(tax_result['total_federal_tax'])}")
+            console.print(f"Louisiana Tax:        {_MONEY(tax_result['total_louisiana_tax'])}")
+            console.print(f"[bold]TOTAL TAX:            {_MONEY(tax_result['total_tax_liability'])}[/bold]")
+            console.print(f"Effective Rate:       {tax_result['combined_effective_rate_percent']:>16}")
     except Exception as e:
         console.print(f"[red]✗ Failed to calculate tax: {e}[/red]")
         logger.error(f"Tax calculation failed: {e}")
@@ -321,38 +461,75 @@ def report():
 def report_schedule_f(entity_id, year):
     """Generate Schedule F report."""
     try:
-        tm = TransactionManager()
-        am = AssetManager()
-        em = EntityManager()
-
-        entity = em.get_entity(entity_id)
-        income = tm.get_income_summary(entity_id, year)
-        expenses = tm.get_expense_summary(entity_id, year)
-        depreciation_data = am.get_total_depreciation_for_entity(entity_id, year)
-        net_profit = income['total_income'] - expenses['total_expenses'] - depreciation_data['total_depreciation']
-
-        rg = ReportGenerator()
-        report_text = rg.generate_schedule_f_summary(
-            entity_name=entity.name,
-            tax_year=year,
-            income_summary=income,
-            expense_summary=expenses,
-            depreciation=depreciation_data['total_depreciation'],
-            net_profit=net_profit
-        )
-
-        console.print(report_text)
-
-        filename = f"schedule_f_{entity.name.replace(' ', '_')}_{year}.txt"
-        filepath = rg.save_report(filename, report_text)
-        console.print(f"\n[green]✓ Report saved to: {filepath}[/green]")
-
-        tm.close()
-        am.close()
-        em.close()
+        from database.database import session_scope
+        from modules.entities.entity_manager import EntityManager
+        from modules.assets.asset_manager import AssetManager
+        from modules.transactions.transaction_manager import TransactionManager
+        from modules.reports.report_generator import ReportGenerator
+
+        with session_scope() as session:
+            tm = TransactionManager(session)
+            am = AssetManager(session)
+            em = EntityManager(session)
+
+            entity = em.get_entity(entity_id)
+            income = tm.get_income_summary(entity_id, year, entity=entity)
+            expenses = tm.get_expense_summary(entity_id, year, entity=entity)
+            depreciation_data = am.get_total_depreciation_for_entity(entity_id, year)
+            net_profit = income['total_income'] - expenses['total_expenses'] - depreciation_data['total_depreciation']
+
+            rg = ReportGenerator()
+            report_text = rg.generate_schedule_f_summary(
+                entity_name=entity.name,
+                tax_year=year,
+                income_summary=income,
+                expense_summary=expenses,
+                depreciation=depreciation_data['total_depreciation'],
+                net_profit=net_profit
+            )
+
+            console.print(report_text)
+
+            filename = f"schedule_f_{entity.name.replace(' ', '_')}_{year}.txt"
+            filepath = rg.save_report(filename, report_text)
+            console.print(f"\n[green]✓ Report saved to: {filepath}[/green]")
     except Exception as e:
         console.print(f"[red]✗ Failed to generate report: {e}[/red]")
 
 
+@cli.command()
+def shell():
+    """Run commands interactively in one process (imports and engine are reused)."""
+    console.print("Tax Assistant shell - type a command (e.g. 'entity list'), 'help', or 'exit'")
+    while True:
+        try:
+            line = input('tax> ')
+        except (EOFError, KeyboardInterrupt):
+            console.print()
+            break
+
+        try:
+            args = shlex.split(line)
+        except ValueError as e:
+            console.print(f"[red]✗ {e}[/red]")
+            continue
+
+        if not args:
+            continue
+        if args[0] in ('exit', 'quit'):
+            break
+        if args[0] == 'help':
+            args = ['--help']
+        if args[0] == 'shell':
+            continue
+
+        try:
+            cli.main(args=args, prog_name='tax', standalone_mode=False)
+        except click.ClickException as e:
+            e.show()
+        except click.Abort:
+            console.print()
+
+
 if __name__ == '__main__':
     cli()
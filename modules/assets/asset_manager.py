@@ -4,18 +4,43 @@ Asset management for tracking equipment, buildings, and other depreciable proper
 
 from database.models import Asset, DepreciationSchedule
 from database.database import get_session
+from sqlalchemy import func
+from sqlalchemy.orm import load_only, selectinload
 from modules.assets.depreciation_calculator import DepreciationCalculator
+from config.tax_constants import MACRS_CLASS_CODES, MACRS_HY_ROW, MACRS_HY_TABLE, depreciate
 from datetime import datetime
+import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Below this many rows, column totals are summed in Python; NumPy's array
+# setup costs more than it saves on small lists.
+NUMPY_SUM_THRESHOLD = 64
+
+# Columns shown by list views
+ASSET_LIST_COLUMNS = (
+    Asset.id, Asset.description, Asset.macrs_class,
+    Asset.purchase_price, Asset.current_book_value, Asset.in_service_date
+)
+
+# Maximum IDs per IN (...) query
+SQLITE_MAX_PARAMS = 999
+
 
 class AssetManager:
     """Manage assets and depreciation schedules."""
 
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session=None):
+        """
+        Initialize the manager.
+
+        Args:
+            session: Session to use (default: get_session()). A passed-in
+                session is left open by close().
+        """
+        self._owns_session = session is None
+        self.session = session if session is not None else get_session()
         self.depreciation_calc = DepreciationCalculator()
 
     def add_asset(self, entity_id, description, purchase_price, purchase_date,
@@ -44,25 +69,111 @@ class AssetManager:
             Asset object
         """
         try:
-            if in_service_date is None:
-                in_service_date = purchase_date
-
-            asset = Asset(
-                entity_id=entity_id,
-                description=description,
-                asset_type=asset_type or 'Equipment',
-                purchase_date=purchase_date,
-                purchase_price=purchase_price,
-                salvage_value=salvage_value,
-                macrs_class=macrs_class,
-                in_service_date=in_service_date,
-                current_book_value=purchase_price,
-                notes=notes
+            asset = self._build_asset(
+                entity_id, description, purchase_price, purchase_date, macrs_class,
+                asset_type=asset_type, in_service_date=in_service_date,
+                salvage_value=salvage_value, notes=notes,
+                auto_calculate_depreciation=auto_calculate_depreciation,
+                use_section_179=use_section_179, section_179_amount=section_179_amount,
+                use_bonus=use_bonus
             )
 
-            # Auto-calculate first year depreciation if requested
-            if auto_calculate_depreciation:
-                first_year = in_service_date.year
+            self.session.add(asset)
+            self.session.commit()
+            logger.info(f"Added asset: {description} for entity {entity_id}")
+            return asset
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to add asset: {e}")
+            raise
+
+    def add_assets_bulk(self, rows):
+        """
+        Add many assets in a single transaction.
+
+        Assets and their first-year schedules are built in memory and
+        flushed together with one commit, instead of one commit per asset.
+        First-year depreciation for all assets is calculated in one
+        calculate_total_depreciation_batch call.
+
+        Args:
+            rows: List of dictionaries of add_asset keyword arguments
+
+        Returns:
+            List of Asset objects
+        """
+        try:
+            depreciation = self._first_year_depreciation_batch(rows)
+            assets = [
+                self._build_asset(**row, depreciation=row_depreciation)
+                for row, row_depreciation in zip(rows, depreciation)
+            ]
+            self.session.add_all(assets)
+            self.session.commit()
+            logger.info(f"Added {len(assets)} assets")
+            return assets
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to add assets: {e}")
+            raise
+
+    def _first_year_depreciation_batch(self, rows):
+        """Calculate first-year depreciation for add_assets_bulk rows (None where not requested)."""
+        depreciation = [None] * len(rows)
+        auto = [i for i, row in enumerate(rows) if row.get('auto_calculate_depreciation', True)]
+        if not auto:
+            return depreciation
+
+        in_service_dates = [rows[i].get('in_service_date') or rows[i]['purchase_date'] for i in auto]
+        amounts = [rows[i].get('section_179_amount') for i in auto]
+        batch = self.depreciation_calc.calculate_total_depreciation_batch(
+            asset_costs=[rows[i]['purchase_price'] for i in auto],
+            macrs_classes=[rows[i]['macrs_class'] for i in auto],
+            placed_in_service_dates=in_service_dates,
+            use_section_179=[rows[i].get('use_section_179', True) for i in auto],
+            section_179_amounts=[np.nan if a is None else a for a in amounts],
+            use_bonus=[rows[i].get('use_bonus', True) for i in auto]
+        )
+
+        keys = ('section_179', 'bonus_depreciation', 'macrs_depreciation', 'total_depreciation', 'remaining_basis')
+        columns = [batch[key].tolist() for key in keys]
+        for i, values in zip(auto, zip(*columns)):
+            depreciation[i] = dict(zip(keys, values))
+        return depreciation
+
+    def _build_asset(self, entity_id, description, purchase_price, purchase_date,
+                     macrs_class, asset_type=None, in_service_date=None,
+                     salvage_value=0.0, notes=None, auto_calculate_depreciation=True,
+                     use_section_179=True, section_179_amount=None, use_bonus=True,
+                     depreciation=None):
+        """
+        Build an Asset (and its first-year schedule) without adding it to the session.
+
+        depreciation may carry a precomputed first-year breakdown (as from
+        calculate_total_depreciation); otherwise it is calculated here.
+        """
+        if in_service_date is None:
+            in_service_date = purchase_date
+
+        asset = Asset(
+            entity_id=entity_id,
+            description=description,
+            asset_type=asset_type or 'Equipment',
+            purchase_date=purchase_date,
+            purchase_price=purchase_price,
+            salvage_value=salvage_value,
+            macrs_class=macrs_class,
+            in_service_date=in_service_date,
+            current_book_value=purchase_price,
+            notes=notes
+        )
+
+        # Auto-calculate first year depreciation if requested
+        if auto_calculate_depreciation:
+            first_year = in_service_date.year
+            if depreciation is None:
                 depreciation = self.depreciation_calc.calculate_total_depreciation(
                     asset_cost=purchase_price,
                     macrs_class=macrs_class,
@@ -73,53 +184,91 @@ class AssetManager:
                     use_bonus=use_bonus
                 )
 
-                asset.section_179_amount = depreciation['section_179']
-                asset.bonus_depreciation_amount = depreciation['bonus_depreciation']
+            asset.section_179_amount = depreciation['section_179']
+            asset.bonus_depreciation_amount = depreciation['bonus_depreciation']
 
-                # Create first year depreciation schedule
-                schedule = DepreciationSchedule(
-                    asset=asset,
-                    tax_year=first_year,
-                    section_179_deduction=depreciation['section_179'],
-                    bonus_depreciation=depreciation['bonus_depreciation'],
-                    macrs_depreciation=depreciation['macrs_depreciation'],
-                    total_depreciation=depreciation['total_depreciation'],
-                    beginning_book_value=purchase_price,
-                    ending_book_value=depreciation['remaining_basis']
-                )
-
-                asset.depreciation_schedules.append(schedule)
-                asset.accumulated_depreciation = depreciation['total_depreciation']
-                asset.current_book_value = depreciation['remaining_basis']
+            # Create first year depreciation schedule
+            schedule = DepreciationSchedule(
+                asset=asset,
+                tax_year=first_year,
+                section_179_deduction=depreciation['section_179'],
+                bonus_depreciation=depreciation['bonus_depreciation'],
+                macrs_depreciation=depreciation['macrs_depreciation'],
+                total_depreciation=depreciation['total_depreciation'],
+                beginning_book_value=purchase_price,
+                ending_book_value=depreciation['remaining_basis']
+            )
 
-            self.session.add(asset)
-            self.session.commit()
-            logger.info(f"Added asset: {description} for entity {entity_id}")
-            return asset
+            asset.depreciation_schedules.append(schedule)
+            asset.accumulated_depreciation = depreciation['total_depreciation']
+            asset.current_book_value = depreciation['remaining_basis']
 
-        except Exception as e:
-            self.session.rollback()
-            logger.error(f"Failed to add asset: {e}")
-            raise
+        return asset
 
     def get_asset(self, asset_id):
-        """Get asset by ID."""
-        return self.session.query(Asset).filter_by(id=asset_id).first()
+        """Get asset by ID (served from the identity map if already loaded)."""
+        return self.session.get(Asset, asset_id)
+
+    def get_assets_by_ids(self, asset_ids):
+        """
+        Get many assets by ID with batched IN queries.
+
+        Args:
+            asset_ids: Iterable of asset IDs (duplicates are ignored)
+
+        Returns:
+            Dictionary of asset_id -> Asset for the IDs that exist
+        """
+        ids = sorted(set(asset_ids))
+        assets = {}
+        # Stay under SQLite's default bound-parameter limit
+        for start in range(0, len(ids), SQLITE_MAX_PARAMS):
+            chunk = ids[start:start + SQLITE_MAX_PARAMS]
+            for asset in self.session.query(Asset).filter(Asset.id.in_(chunk)):
+                assets[asset.id] = asset
+        return assets
+
+    def get_assets_by_entity(self, entity_id, active_only=True, columns=None):
+        """
+        Get all assets for an entity.
+
+        Args:
+            entity_id: Entity ID
+            active_only: Only return active assets (default True)
+            columns: Asset attributes to load (default: all columns plus
+                depreciation schedules)
 
-    def get_assets_by_entity(self, entity_id, active_only=True):
-        """Get all assets for an entity."""
-        query = self.session.query(Asset).filter_by(entity_id=entity_id)
+        Returns:
+            List of Asset objects
+        """
+        query = self._asset_query(columns).filter(Asset.entity_id == entity_id)
         if active_only:
-            query = query.filter_by(active=True)
+            query = query.filter(Asset.active == True)
         return query.all()
 
-    def get_all_assets(self, active_only=True):
-        """Get all assets across all entities."""
-        query = self.session.query(Asset)
+    def get_all_assets(self, active_only=True, columns=None):
+        """
+        Get all assets across all entities.
+
+        Args:
+            active_only: Only return active assets (default True)
+            columns: Asset attributes to load (default: all columns plus
+                depreciation schedules)
+
+        Returns:
+            List of Asset objects
+        """
+        query = self._asset_query(columns)
         if active_only:
-            query = query.filter_by(active=True)
+            query = query.filter(Asset.active == True)
         return query.all()
 
+    def _asset_query(self, columns=None):
+        """Build an Asset query that loads only the given columns, if any."""
+        if columns:
+            return self.session.query(Asset).options(load_only(*columns))
+        return self.session.query(Asset).options(selectinload(Asset.depreciation_schedules))
+
     def calculate_depreciation_for_year(self, asset_id, tax_year):
         """
         Calculate depreciation for a specific year.
@@ -131,41 +280,91 @@ class AssetManager:
         Returns:
             DepreciationSchedule object
         """
+        return self.calculate_depreciation_range(asset_id, tax_year, tax_year)[0]
+
+    def calculate_depreciation_range(self, asset_id, start_year, end_year):
+        """
+        Calculate depreciation for a range of years.
+
+        Existing schedules for the range (and the year before it) are fetched
+        in one query; missing years are computed in order and saved with a
+        single commit.
+
+        Args:
+            asset_id: Asset ID
+            start_year: First tax year to calculate
+            end_year: Last tax year to calculate (inclusive)
+
+        Returns:
+            List of DepreciationSchedule objects, one per year
+        """
         asset = self.get_asset(asset_id)
         if not asset:
             raise ValueError(f"Asset {asset_id} not found")
 
-        # Check if already calculated
-        existing = self.session.query(DepreciationSchedule).filter_by(
-            asset_id=asset_id,
-            tax_year=tax_year
-        ).first()
-
-        if existing:
-            logger.info(f"Depreciation for asset {asset_id} year {tax_year} already exists")
-            return existing
+        by_year = {
+            schedule.tax_year: schedule
+            for schedule in self.session.query(DepreciationSchedule).filter(
+                DepreciationSchedule.asset_id == asset_id,
+                DepreciationSchedule.tax_year.between(start_year - 1, end_year)
+            ).order_by(DepreciationSchedule.tax_year)
+        }
 
-        # Determine year in service
         placed_year = asset.in_service_date.year
-        year_in_service = tax_year - placed_year + 1
+        schedules = []
+        new_schedules = []
 
-        if year_in_service < 1:
-            raise ValueError(f"Tax year {tax_year} is before asset placed in service")
+        for tax_year in range(start_year, end_year + 1):
+            # Check if already calculated
+            if tax_year in by_year:
+                logger.info(f"Depreciation for asset {asset_id} year {tax_year} already exists")
+                schedules.append(by_year[tax_year])
+                continue
 
-        # Get beginning book value (ending book value from prior year)
-        if year_in_service == 1:
-            beginning_book_value = asset.purchase_price
-        else:
-            prior_year_schedule = self.session.query(DepreciationSchedule).filter_by(
-                asset_id=asset_id,
-                tax_year=tax_year - 1
-            ).first()
+            # Determine year in service
+            year_in_service = tax_year - placed_year + 1
+
+            if year_in_service < 1:
+                raise ValueError(f"Tax year {tax_year} is before asset placed in service")
+
+            # Get beginning book value (ending book value from prior year)
+            if year_in_service == 1:
+                beginning_book_value = asset.purchase_price
+            else:
+                prior_year_schedule = by_year.get(tax_year - 1)
 
-            if not prior_year_schedule:
-                raise ValueError(f"Prior year depreciation not found for year {tax_year - 1}")
+                if not prior_year_schedule:
+                    raise ValueError(f"Prior year depreciation not found for year {tax_year - 1}")
 
-            beginning_book_value = prior_year_schedule.ending_book_value
+                beginning_book_value = prior_year_schedule.ending_book_value
 
+            schedule = self._build_schedule(asset, tax_year, year_in_service, beginning_book_value)
+            by_year[tax_year] = schedule
+            schedules.append(schedule)
+            new_schedules.append(schedule)
+
+        if not new_schedules:
+            return schedules
+
+        try:
+            self.session.add_all(new_schedules)
+
+            # Update asset accumulated depreciation
+            for schedule in new_schedules:
+                asset.accumulated_depreciation += schedule.total_depreciation
+                asset.current_book_value = schedule.ending_book_value
+
+            self.session.commit()
+            logger.info(f"Calculated depreciation for asset {asset_id} years {start_year}-{end_year}")
+            return schedules
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to calculate depreciation: {e}")
+            raise
+
+    def _build_schedule(self, asset, tax_year, year_in_service, beginning_book_value):
+        """Build the DepreciationSchedule for one year of an asset's recovery period."""
         # Calculate depreciation
         if year_in_service == 1:
             # First year - may include Section 179 and Bonus
@@ -179,7 +378,7 @@ class AssetManager:
             )
 
             schedule = DepreciationSchedule(
-                asset_id=asset_id,
+                asset_id=asset.id,
                 tax_year=tax_year,
                 section_179_deduction=depreciation['section_179'],
                 bonus_depreciation=depreciation['bonus_depreciation'],
@@ -203,7 +402,7 @@ class AssetManager:
             total_depr = macrs_calc['macrs_amount']
 
             schedule = DepreciationSchedule(
-                asset_id=asset_id,
+                asset_id=asset.id,
                 tax_year=tax_year,
                 section_179_deduction=0.0,
                 bonus_depreciation=0.0,
@@ -214,21 +413,103 @@ class AssetManager:
                 is_final_year=macrs_calc['fully_depreciated']
             )
 
-        try:
-            self.session.add(schedule)
+        return schedule
 
-            # Update asset accumulated depreciation
-            asset.accumulated_depreciation += schedule.total_depreciation
-            asset.current_book_value = schedule.ending_book_value
+    def calculate_depreciation_for_all_assets(self, tax_year):
+        """
+        Calculate depreciation for every active asset in a tax year.
 
-            self.session.commit()
-            logger.info(f"Calculated depreciation for asset {asset_id} year {tax_year}")
-            return schedule
+        Assets in a later year of a half-year MACRS class are computed in one
+        vectorized pass and bulk-inserted. First-year assets and other
+        conventions go through calculate_depreciation_for_year.
 
-        except Exception as e:
-            self.session.rollback()
-            logger.error(f"Failed to calculate depreciation: {e}")
-            raise
+        Args:
+            tax_year: Tax year to calculate
+
+        Returns:
+            List of new DepreciationSchedule objects
+        """
+        assets = self.get_all_assets(active_only=True)
+
+        existing = {
+            asset_id for (asset_id,) in self.session.query(DepreciationSchedule.asset_id).filter(
+                DepreciationSchedule.tax_year == tax_year
+            )
+        }
+        prior_ending = dict(
+            self.session.query(DepreciationSchedule.asset_id, DepreciationSchedule.ending_book_value).filter(
+                DepreciationSchedule.tax_year == tax_year - 1
+            )
+        )
+
+        batch = []
+        single = []
+        for asset in assets:
+            if asset.id in existing or asset.in_service_date is None:
+                continue
+            if asset.in_service_date.year > tax_year:
+                continue
+
+            code = MACRS_CLASS_CODES.get(asset.macrs_class)
+            if (code is not None and MACRS_HY_ROW[code] >= 0 and asset.id in prior_ending
+                    and asset.in_service_date.year < tax_year):
+                batch.append(asset)
+            else:
+                single.append(asset)
+
+        schedules = []
+        if batch:
+            macrs_basis = np.fromiter(
+                (a.purchase_price - a.section_179_amount - a.bonus_depreciation_amount for a in batch),
+                dtype=np.float64, count=len(batch)
+            )
+            class_codes = np.fromiter(
+                (MACRS_CLASS_CODES[a.macrs_class] for a in batch),
+                dtype=np.intp, count=len(batch)
+            )
+            class_idx = MACRS_HY_ROW[class_codes]
+            year_offset = np.fromiter(
+                (tax_year - a.in_service_date.year for a in batch),
+                dtype=np.intp, count=len(batch)
+            )
+            macrs_amounts = depreciate(macrs_basis, class_idx, year_offset)
+            recovery_years = (MACRS_HY_TABLE[class_idx] > 0).sum(axis=1)
+
+            fully_depreciated = (macrs_basis <= 0) | (year_offset + 1 > recovery_years)
+
+            for asset, amount, final in zip(batch, macrs_amounts.tolist(), fully_depreciated.tolist()):
+                beginning_book_value = prior_ending[asset.id]
+                schedules.append(DepreciationSchedule(
+                    asset_id=asset.id,
+                    tax_year=tax_year,
+                    section_179_deduction=0.0,
+                    bonus_depreciation=0.0,
+                    macrs_depreciation=amount,
+                    total_depreciation=amount,
+                    beginning_book_value=beginning_book_value,
+                    ending_book_value=beginning_book_value - amount,
+                    is_final_year=final
+                ))
+
+            try:
+                self.session.bulk_save_objects(schedules)
+
+                for asset, schedule in zip(batch, schedules):
+                    asset.accumulated_depreciation += schedule.total_depreciation
+                    asset.current_book_value = schedule.ending_book_value
+
+                self.session.commit()
+                logger.info(f"Calculated depreciation for {len(schedules)} assets year {tax_year}")
+
+            except Exception as e:
+                self.session.rollback()
+                logger.error(f"Failed to calculate batch depreciation: {e}")
+                raise
+
+        for asset in single:
+            schedules.append(self.calculate_depreciation_for_year(asset.id, tax_year))
+
+        return schedules
 
     def get_total_depreciation_for_entity(self, entity_id, tax_year):
         """
@@ -241,31 +522,107 @@ class AssetManager:
         Returns:
             Dictionary with depreciation breakdown
         """
-        assets = self.get_assets_by_entity(entity_id, active_only=True)
+        totals = self.get_total_depreciation_by_entity(tax_year, entity_ids=[entity_id])
+        return totals.get(entity_id) or self._depreciation_totals(entity_id, tax_year, 0.0, 0.0, 0.0, 0)
 
-        total_section_179 = 0.0
-        total_bonus = 0.0
-        total_macrs = 0.0
+    def get_total_depreciation_by_entity(self, tax_year, entity_ids=None):
+        """
+        Get total depreciation per entity in a given tax year.
 
-        for asset in assets:
-            schedule = self.session.query(DepreciationSchedule).filter_by(
-                asset_id=asset.id,
-                tax_year=tax_year
-            ).first()
+        One GROUP BY query covers all entities; the outer join keeps assets
+        without a schedule for the year in the asset count.
 
-            if schedule:
-                total_section_179 += schedule.section_179_deduction
-                total_bonus += schedule.bonus_depreciation
-                total_macrs += schedule.macrs_depreciation
+        Args:
+            tax_year: Tax year
+            entity_ids: Entity IDs to include (default: all entities)
+
+        Returns:
+            Dictionary of entity_id -> depreciation breakdown (entities with
+            no active assets are omitted)
+        """
+        query = self.session.query(
+            Asset.entity_id,
+            func.coalesce(func.sum(DepreciationSchedule.section_179_deduction), 0.0),
+            func.coalesce(func.sum(DepreciationSchedule.bonus_depreciation), 0.0),
+            func.coalesce(func.sum(DepreciationSchedule.macrs_depreciation), 0.0),
+            func.count(Asset.id)
+        ).outerjoin(
+            DepreciationSchedule,
+            (DepreciationSchedule.asset_id == Asset.id) & (DepreciationSchedule.tax_year == tax_year)
+        ).filter(Asset.active == True)
+
+        if entity_ids is not None:
+            query = query.filter(Asset.entity_id.in_(entity_ids))
+
+        return {
+            entity_id: self._depreciation_totals(entity_id, tax_year, section_179, bonus, macrs, asset_count)
+            for entity_id, section_179, bonus, macrs, asset_count in query.group_by(Asset.entity_id)
+        }
+
+    def get_depreciation_details_for_entity(self, entity_id, tax_year):
+        """
+        Get per-asset depreciation detail for an entity in a given tax year.
 
+        Rows are in the shape generate_depreciation_report expects. Totals
+        are summed with NumPy when there are NUMPY_SUM_THRESHOLD or more rows.
+
+        Args:
+            entity_id: Entity ID
+            tax_year: Tax year
+
+        Returns:
+            Dictionary with 'assets' detail rows plus the depreciation breakdown
+        """
+        rows = self.session.query(
+            Asset.description,
+            Asset.macrs_class,
+            DepreciationSchedule.section_179_deduction,
+            DepreciationSchedule.bonus_depreciation,
+            DepreciationSchedule.macrs_depreciation
+        ).join(
+            DepreciationSchedule, DepreciationSchedule.asset_id == Asset.id
+        ).filter(
+            Asset.entity_id == entity_id,
+            Asset.active == True,
+            DepreciationSchedule.tax_year == tax_year
+        ).order_by(Asset.id).all()
+
+        amounts = [(s179 or 0.0, bonus or 0.0, macrs or 0.0) for _, _, s179, bonus, macrs in rows]
+        if len(amounts) >= NUMPY_SUM_THRESHOLD:
+            total_section_179, total_bonus, total_macrs = np.array(amounts, dtype=np.float64).sum(axis=0).tolist()
+        else:
+            total_section_179 = sum(a[0] for a in amounts)
+            total_bonus = sum(a[1] for a in amounts)
+            total_macrs = sum(a[2] for a in amounts)
+
+        totals = self._depreciation_totals(
+            entity_id, tax_year, total_section_179, total_bonus, total_macrs, len(rows)
+        )
+        totals['assets'] = [
+            {
+                'description': description,
+                'macrs_class': macrs_class or '',
+                'section_179': float(s179),
+                'bonus_depreciation': float(bonus),
+                'macrs_depreciation': float(macrs)
+            }
+            for (description, macrs_class, _, _, _), (s179, bonus, macrs) in zip(rows, amounts)
+        ]
+        return totals
+
+    def _depreciation_totals(self, entity_id, tax_year, section_179, bonus, macrs, asset_count):
+        """Build the depreciation breakdown dictionary for an entity."""
+        section_179 = float(section_179)
+        bonus = float(bonus)
+        macrs = float(macrs)
         return {
             'entity_id': entity_id,
             'tax_year': tax_year,
-            'section_179': total_section_179,
-            'bonus_depreciation': total_bonus,
-            'macrs_depreciation': total_macrs,
-            'total_depreciation': total_section_179 + total_bonus + total_macrs,
-            'asset_count': len(assets)
+            'section_179': section_179,
+            'bonus_depreciation': bonus,
+            'macrs_depreciation': macrs,
+            'total_depreciation': section_179 + bonus + macrs,
+            'asset_count': asset_count
         }
 
     def dispose_asset(self, asset_id, disposal_date, disposal_proceeds):
@@ -310,5 +667,6 @@ class AssetManager:
             raise
 
     def close(self):
-        """Close database session."""
-        self.session.close()
+        """Close database session (only if this manager opened it)."""
+        if self._owns_session:
+            self.session.close()
@@ -13,9 +13,111 @@ from config.tax_constants import (
     MACRS_DEPRECIATION_RATES_HY
 )
 from datetime import datetime
-import logging
+from functools import lru_cache
+import numpy as np
+
+# Half-year convention rates keyed by class name, frozen at import so a
+# rate lookup is one dict hit plus a tuple index.
+MACRS_HALF_YEAR = {
+    name: tuple(MACRS_DEPRECIATION_RATES_HY[int(info['recovery_period'])])
+    for name, info in MACRS_CLASSES.items()
+    if info['convention'] == 'half-year'
+}
+
+# Per-class (recovery_period, half-year rates) built once, so a rate lookup
+# is a single dict hit instead of several nested lookups.
+_MACRS_CLASS_INFO = {
+    name: (int(info['recovery_period']), MACRS_HALF_YEAR.get(name, ()))
+    for name, info in MACRS_CLASSES.items()
+}
+
+# Bonus depreciation rate by placed-in-service year; years outside the
+# table take the 2024 rate (later years) or the 2022 rate (earlier years)
+_BONUS_RATES = {
+    2022: BONUS_DEPRECIATION_RATE_2022,
+    2023: BONUS_DEPRECIATION_RATE_2023,
+    2024: BONUS_DEPRECIATION_RATE_2024,
+}
+
+# One record per asset for batched first-year depreciation; field names
+# match the keys of calculate_total_depreciation's result
+DEPRECIATION_DTYPE = np.dtype([
+    ('asset_cost', 'f8'),
+    ('section_179', 'f8'),
+    ('bonus_depreciation', 'f8'),
+    ('bonus_rate', 'f8'),
+    ('macrs_depreciation', 'f8'),
+    ('macrs_rate', 'f8'),
+    ('total_depreciation', 'f8'),
+    ('remaining_basis', 'f8'),
+    ('basis_for_future_macrs', 'f8'),
+])
+
+
+def _section_179_limit(total_equipment_placed=None):
+    """Get the maximum Section 179 deduction after the dollar-for-dollar phase-out."""
+    max_deduction = SECTION_179_LIMIT_2024
+    if total_equipment_placed and total_equipment_placed > SECTION_179_PHASE_OUT_THRESHOLD_2024:
+        excess = total_equipment_placed - SECTION_179_PHASE_OUT_THRESHOLD_2024
+        max_deduction = max(0, max_deduction - excess)
+    return max_deduction
+
+
+@lru_cache(maxsize=64)
+def _bonus_rate(year):
+    """Get the bonus depreciation rate for a placed-in-service year (cached per year)."""
+    rate = _BONUS_RATES.get(year)
+    if rate is None:
+        rate = BONUS_DEPRECIATION_RATE_2024 if year >= 2024 else BONUS_DEPRECIATION_RATE_2022
+    return rate
+
+
+@lru_cache(maxsize=4096)
+def _macrs_rate(macrs_class, year_in_service):
+    """
+    Look up the MACRS rate for a class and year of service.
+
+    The rate only depends on the class and the year of service, so results
+    are cached and shared across assets.
+
+    Args:
+        macrs_class: MACRS class (e.g., '3-year', '5-year', '7-year')
+        year_in_service: Which year of the asset's recovery period (1, 2, 3, ...)
+
+    Returns:
+        Tuple of (depreciation_rate, recovery_period, recovery_years)
+    """
+    # Get MACRS class information
+    try:
+        recovery_period, rates = _MACRS_CLASS_INFO[macrs_class]
+    except KeyError:
+        raise ValueError(f"Invalid MACRS class: {macrs_class}") from None
+
+    # Get depreciation rate for this year
+    # Note: MACRS tables are 0-indexed, so year_in_service=1 uses index 0
+    recovery_years = len(rates)
+    if rates:
+        if year_in_service - 1 < recovery_years:
+            depreciation_rate = rates[year_in_service - 1]
+        else:
+            depreciation_rate = 0.0  # Fully depreciated
+    else:
+        # For classes not in the table, use straight-line
+        depreciation_rate = 1.0 / recovery_period
+
+    return depreciation_rate, recovery_period, recovery_years
+
 
-logger = logging.getLogger(__name__)
+@lru_cache(maxsize=1024)
+def _macrs_rate_table(macrs_class, years):
+    """Get the MACRS rates for years 1..years of a class as a read-only float64 array."""
+    rates = np.fromiter(
+        (_macrs_rate(macrs_class, year_in_service)[0] for year_in_service in range(1, years + 1)),
+        dtype=np.float64,
+        count=years
+    )
+    rates.flags.writeable = False
+    return rates
 
 
 class DepreciationCalculator:
@@ -40,14 +142,7 @@ class DepreciationCalculator:
         Returns:
             Bonus depreciation rate (0.0 to 1.0)
         """
-        year = tax_year or self.tax_year
-
-        if year >= 2024:
-            return BONUS_DEPRECIATION_RATE_2024  # 60%
-        elif year == 2023:
-            return BONUS_DEPRECIATION_RATE_2023  # 80%
-        else:
-            return BONUS_DEPRECIATION_RATE_2022  # 100%
+        return _bonus_rate(tax_year or self.tax_year)
 
     def calculate_section_179(self, asset_cost, total_equipment_placed=None, elected_amount=None):
         """
@@ -65,13 +160,8 @@ class DepreciationCalculator:
         Returns:
             Dictionary with Section 179 calculation details
         """
-        # Maximum Section 179 deduction for the year
-        max_deduction = SECTION_179_LIMIT_2024
-
-        # Check for phase-out
-        if total_equipment_placed and total_equipment_placed > SECTION_179_PHASE_OUT_THRESHOLD_2024:
-            excess = total_equipment_placed - SECTION_179_PHASE_OUT_THRESHOLD_2024
-            max_deduction = max(0, max_deduction - excess)
+        # Maximum Section 179 deduction for the year, after phase-out
+        max_deduction = _section_179_limit(total_equipment_placed)
 
         # Determine Section 179 amount
         if elected_amount is not None:
@@ -89,6 +179,35 @@ class DepreciationCalculator:
             'fully_expensed': section_179_amount == asset_cost
         }
 
+    def calculate_section_179_batch(self, asset_costs, total_equipment_placed=None, elected_amounts=None):
+        """
+        Calculate Section 179 deductions for many assets at once.
+
+        Same rules as calculate_section_179, written as array min/max so
+        there is no per-asset branching.
+
+        Args:
+            asset_costs: Sequence of asset costs
+            total_equipment_placed: Total equipment placed in service (scalar or per asset)
+            elected_amounts: Per-asset amounts to elect (None or NaN = maximize)
+
+        Returns:
+            ndarray of Section 179 amounts
+        """
+        costs = np.asarray(asset_costs, dtype=np.float64)
+
+        placed = np.asarray(0.0 if total_equipment_placed is None else total_equipment_placed, dtype=np.float64)
+        excess = np.maximum(0.0, placed - SECTION_179_PHASE_OUT_THRESHOLD_2024)
+        max_deduction = np.maximum(0.0, SECTION_179_LIMIT_2024 - excess)
+
+        if elected_amounts is None:
+            elected = np.inf
+        else:
+            elected = np.asarray(elected_amounts, dtype=np.float64)
+            elected = np.where(np.isnan(elected), np.inf, elected)
+
+        return np.minimum(np.minimum(elected, costs), max_deduction)
+
     def calculate_bonus_depreciation(self, remaining_basis, placed_in_service_date=None):
         """
         Calculate bonus depreciation.
@@ -143,26 +262,7 @@ class DepreciationCalculator:
                 'fully_depreciated': True
             }
 
-        # Get MACRS class information
-        if macrs_class not in MACRS_CLASSES:
-            raise ValueError(f"Invalid MACRS class: {macrs_class}")
-
-        class_info = MACRS_CLASSES[macrs_class]
-        recovery_period = int(class_info['recovery_period'])
-
-        # Get depreciation rate for this year
-        # Note: MACRS tables are 0-indexed, so year_in_service=1 uses index 0
-        if recovery_period in MACRS_DEPRECIATION_RATES_HY:
-            rates = MACRS_DEPRECIATION_RATES_HY[recovery_period]
-            rate_index = year_in_service - 1
-
-            if rate_index < len(rates):
-                depreciation_rate = rates[rate_index]
-            else:
-                depreciation_rate = 0.0  # Fully depreciated
-        else:
-            # For classes not in the table, use straight-line
-            depreciation_rate = 1.0 / recovery_period
+        depreciation_rate, recovery_period, recovery_years = _macrs_rate(macrs_class, year_in_service)
 
         macrs_amount = asset_basis * depreciation_rate
 
@@ -171,7 +271,7 @@ class DepreciationCalculator:
             'depreciation_rate': depreciation_rate,
             'year_in_service': year_in_service,
             'recovery_period': recovery_period,
-            'fully_depreciated': year_in_service > len(MACRS_DEPRECIATION_RATES_HY.get(recovery_period, []))
+            'fully_depreciated': year_in_service > recovery_years
         }
 
     def calculate_total_depreciation(self, asset_cost, macrs_class, placed_in_service_date,
@@ -180,7 +280,9 @@ class DepreciationCalculator:
         """
         Calculate total first-year depreciation for an asset.
 
-        This combines Section 179, Bonus Depreciation, and MACRS.
+        This combines Section 179, Bonus Depreciation, and MACRS in one pass,
+        with the same results as applying the individual calculate_* methods
+        in order.
 
         Args:
             asset_cost: Original cost of asset
@@ -206,40 +308,36 @@ class DepreciationCalculator:
             'remaining_basis': asset_cost
         }
 
+        # The three steps are inlined rather than calling calculate_section_179,
+        # calculate_bonus_depreciation and calculate_macrs_depreciation, which
+        # would each build a dict only for one or two values to be read back
         current_basis = asset_cost
 
         # Step 1: Section 179 (if elected)
         if use_section_179 and current_basis > 0:
-            s179_calc = self.calculate_section_179(
-                current_basis,
-                total_equipment_placed,
-                section_179_amount
-            )
-            result['section_179'] = s179_calc['section_179_amount']
-            current_basis = s179_calc['remaining_basis']
+            max_deduction = _section_179_limit(total_equipment_placed)
+            if section_179_amount is not None:
+                section_179 = min(section_179_amount, current_basis, max_deduction)
+            else:
+                section_179 = min(current_basis, max_deduction)
+            result['section_179'] = section_179
+            current_basis = current_basis - section_179
 
         # Step 2: Bonus Depreciation (if elected and applicable)
         if use_bonus and current_basis > 0:
-            bonus_calc = self.calculate_bonus_depreciation(
-                current_basis,
-                placed_in_service_date
-            )
-            result['bonus_depreciation'] = bonus_calc['bonus_amount']
-            result['bonus_rate'] = bonus_calc['bonus_rate']
-            current_basis = bonus_calc['remaining_basis']
+            bonus_rate = _bonus_rate(placed_in_service_date.year if placed_in_service_date else self.tax_year)
+            bonus = current_basis * bonus_rate
+            result['bonus_depreciation'] = bonus
+            result['bonus_rate'] = bonus_rate
+            current_basis = current_basis - bonus
 
         # Step 3: MACRS Depreciation on remaining basis
         if current_basis > 0:
-            macrs_calc = self.calculate_macrs_depreciation(
-                current_basis,
-                macrs_class,
-                year_in_service=1,
-                current_year=year,
-                placed_in_service_date=placed_in_service_date
-            )
-            result['macrs_depreciation'] = macrs_calc['macrs_amount']
-            result['macrs_rate'] = macrs_calc['depreciation_rate']
-            current_basis -= macrs_calc['macrs_amount']
+            macrs_rate = _macrs_rate(macrs_class, 1)[0]
+            macrs = current_basis * macrs_rate
+            result['macrs_depreciation'] = macrs
+            result['macrs_rate'] = macrs_rate
+            current_basis -= macrs
 
         # Calculate totals
         result['total_depreciation'] = (
@@ -252,6 +350,65 @@ class DepreciationCalculator:
 
         return result
 
+    def calculate_total_depreciation_batch(self, asset_costs, macrs_classes, placed_in_service_dates,
+                                           use_section_179=True, section_179_amounts=None,
+                                           use_bonus=True, total_equipment_placed=None):
+        """
+        Calculate total first-year depreciation for many assets at once.
+
+        Equivalent to calling calculate_total_depreciation per asset, but
+        Section 179, bonus and MACRS are applied as array operations. Each
+        asset's Section 179 is limited independently, as in the scalar method.
+
+        Args:
+            asset_costs: Sequence of original asset costs
+            macrs_classes: Sequence of MACRS classifications
+            placed_in_service_dates: Sequence of dates placed in service
+            use_section_179: Whether to use Section 179 (bool or per-asset sequence)
+            section_179_amounts: Per-asset Section 179 amounts (None or NaN = maximize)
+            use_bonus: Whether to use bonus depreciation (bool or per-asset sequence)
+            total_equipment_placed: Total equipment for Section 179 phase-out
+
+        Returns:
+            Structured ndarray of DEPRECIATION_DTYPE, one record per asset
+        """
+        costs = np.asarray(asset_costs, dtype=np.float64)
+        count = len(costs)
+        placed_years = np.fromiter((d.year for d in placed_in_service_dates), dtype=np.int64, count=count)
+
+        # First-year MACRS rate per distinct class, gathered back per asset
+        class_names, class_idx = np.unique(np.asarray(macrs_classes, dtype=object), return_inverse=True)
+        rate_table = np.array([_macrs_rate(name, 1)[0] for name in class_names], dtype=np.float64)
+        macrs_rates = rate_table[class_idx]
+
+        # Step 1: Section 179
+        section_179 = self.calculate_section_179_batch(costs, total_equipment_placed, section_179_amounts)
+        section_179 = np.where(np.asarray(use_section_179, dtype=bool) & (costs > 0), section_179, 0.0)
+        basis = costs - section_179
+
+        # Step 2: Bonus depreciation at the placed-in-service year's rate
+        bonus_rates = np.where(
+            placed_years >= 2024, BONUS_DEPRECIATION_RATE_2024,
+            np.where(placed_years == 2023, BONUS_DEPRECIATION_RATE_2023, BONUS_DEPRECIATION_RATE_2022)
+        )
+        bonus = np.where(np.asarray(use_bonus, dtype=bool) & (basis > 0), basis * bonus_rates, 0.0)
+        basis = basis - bonus
+
+        # Step 3: MACRS on the remaining basis
+        macrs = np.where(basis > 0, basis * macrs_rates, 0.0)
+
+        result = np.empty(count, dtype=DEPRECIATION_DTYPE)
+        result['asset_cost'] = costs
+        result['section_179'] = section_179
+        result['bonus_depreciation'] = bonus
+        result['bonus_rate'] = bonus_rates
+        result['macrs_depreciation'] = macrs
+        result['macrs_rate'] = macrs_rates
+        result['total_depreciation'] = section_179 + bonus + macrs
+        result['remaining_basis'] = basis - macrs
+        result['basis_for_future_macrs'] = costs - section_179 - bonus
+        return result
+
     def calculate_annual_depreciation_schedule(self, asset_cost, macrs_class,
                                                placed_in_service_date, first_year_section_179=0.0,
                                                first_year_bonus=0.0, years_to_project=None):
@@ -269,69 +426,63 @@ class DepreciationCalculator:
         Returns:
             List of dictionaries with yearly depreciation
         """
-        if macrs_class not in MACRS_CLASSES:
-            raise ValueError(f"Invalid MACRS class: {macrs_class}")
-
-        recovery_period = int(MACRS_CLASSES[macrs_class]['recovery_period'])
+        try:
+            recovery_period = _MACRS_CLASS_INFO[macrs_class][0]
+        except KeyError:
+            raise ValueError(f"Invalid MACRS class: {macrs_class}") from None
 
         # MACRS tables typically have recovery_period + 1 entries due to half-year convention
         if years_to_project is None:
             years_to_project = recovery_period + 1
+        if years_to_project <= 0:
+            return []
 
         # Calculate basis for MACRS (after Section 179 and Bonus)
         macrs_basis = asset_cost - first_year_section_179 - first_year_bonus
 
-        schedule = []
-        remaining_book_value = asset_cost
         placed_year = placed_in_service_date.year
+        years = np.arange(1, years_to_project + 1)
 
-        for year_number in range(1, years_to_project + 1):
-            year_data = {
-                'year': placed_year + year_number - 1,
-                'year_in_service': year_number,
-                'beginning_book_value': remaining_book_value
+        # MACRS for every year at once; basis is fixed, only the rate varies
+        if macrs_basis > 0:
+            macrs = macrs_basis * _macrs_rate_table(macrs_class, years_to_project)
+        else:
+            macrs = np.zeros(years_to_project)
+
+        # First year includes Section 179 and Bonus
+        section_179 = np.zeros(years_to_project)
+        bonus = np.zeros(years_to_project)
+        section_179[0] = first_year_section_179
+        bonus[0] = first_year_bonus
+        total = section_179 + bonus + macrs
+
+        # Sequential subtraction (not asset_cost - cumsum) so book values
+        # match a year-by-year running balance exactly
+        book_values = np.subtract.accumulate(np.concatenate(([asset_cost], total)))
+        beginning = book_values[:-1]
+        ending = book_values[1:]
+
+        # Stop after the first year the asset is fully depreciated
+        depleted = ending <= 0
+        if depleted.any():
+            n_years = int(np.argmax(depleted)) + 1
+        else:
+            n_years = years_to_project
+
+        schedule = [
+            {
+                'year': placed_year + int(year_number) - 1,
+                'year_in_service': int(year_number),
+                'beginning_book_value': begin,
+                'section_179': first_year_section_179 if year_number == 1 else 0.0,
+                'bonus_depreciation': first_year_bonus if year_number == 1 else 0.0,
+                'macrs_depreciation': year_macrs,
+                'total_depreciation': year_total,
+                'ending_book_value': max(0, end)
             }
-
-            # First year includes Section 179 and Bonus
-            if year_number == 1:
-                year_data['section_179'] = first_year_section_179
-                year_data['bonus_depreciation'] = first_year_bonus
-
-                # First year MACRS
-                if macrs_basis > 0:
-                    macrs_calc = self.calculate_macrs_depreciation(
-                        macrs_basis, macrs_class, year_number
-                    )
-                    year_data['macrs_depreciation'] = macrs_calc['macrs_amount']
-                else:
-                    year_data['macrs_depreciation'] = 0.0
-            else:
-                # Subsequent years - only MACRS
-                year_data['section_179'] = 0.0
-                year_data['bonus_depreciation'] = 0.0
-
-                if macrs_basis > 0:
-                    macrs_calc = self.calculate_macrs_depreciation(
-                        macrs_basis, macrs_class, year_number
-                    )
-                    year_data['macrs_depreciation'] = macrs_calc['macrs_amount']
-                else:
-                    year_data['macrs_depreciation'] = 0.0
-
-            # Calculate totals
-            year_data['total_depreciation'] = (
-                year_data.get('section_179', 0.0) +
-                year_data.get('bonus_depreciation', 0.0) +
-                year_data['macrs_depreciation']
+            for year_number, begin, year_macrs, year_total, end in zip(
+                years.tolist(), beginning.tolist(), macrs.tolist(), total.tolist(), ending.tolist()
             )
-
-            remaining_book_value -= year_data['total_depreciation']
-            year_data['ending_book_value'] = max(0, remaining_book_value)
-
-            schedule.append(year_data)
-
-            # Stop if fully depreciated
-            if remaining_book_value <= 0:
-                break
+        ][:n_years]
 
         return schedule
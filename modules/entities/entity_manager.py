@@ -2,9 +2,11 @@
 Entity management for farm and holding companies.
 """
 
-from database.models import Entity, EntityType, AccountingMethod
+from database.models import Entity, Asset, Transaction, ENTITY_TYPES, ACCOUNTING_METHODS, normalize_choice
 from database.database import get_session
-from datetime import datetime
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import selectinload
+from datetime import datetime, timezone
 import logging
 
 logger = logging.getLogger(__name__)
@@ -13,11 +15,28 @@ logger = logging.getLogger(__name__)
 class EntityManager:
     """Manage business entities."""
 
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session=None):
+        """
+        Initialize the manager.
+
+        Args:
+            session: Session to use (default: get_session()). A passed-in
+                session is left open by close().
+        """
+        self._owns_session = session is None
+        self.session = session if session is not None else get_session()
+
+    def __enter__(self):
+        """Use the manager as a context manager that closes on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Close the manager's session (see close())."""
+        self.close()
+        return False
 
     def create_entity(self, name, entity_type, accounting_method='cash', ein=None,
-                     formation_date=None, state='LA', notes=None):
+                     formation_date=None, state='LA', notes=None, commit=True):
         """
         Create a new business entity.
 
@@ -29,16 +48,16 @@ class EntityManager:
             formation_date: Date entity was formed
             state: State code (default LA)
             notes: Additional notes
+            commit: Commit immediately; with False the entity is only flushed
+                so the caller can commit several changes together
 
         Returns:
             Entity object
         """
         try:
-            # Convert string to enum
-            if isinstance(entity_type, str):
-                entity_type = EntityType[entity_type.upper()]
-            if isinstance(accounting_method, str):
-                accounting_method = AccountingMethod[accounting_method.upper()]
+            # Normalize enum members/strings to stored values
+            entity_type = normalize_choice(entity_type, ENTITY_TYPES)
+            accounting_method = normalize_choice(accounting_method, ACCOUNTING_METHODS)
 
             entity = Entity(
                 name=name,
@@ -51,13 +70,53 @@ class EntityManager:
             )
 
             self.session.add(entity)
-            self.session.commit()
-            logger.info(f"Created entity: {name} ({entity_type.value})")
+            if commit:
+                self.session.commit()
+            else:
+                self.session.flush()
+            logger.info("Created entity: %s (%s)", name, entity_type)
             return entity
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Failed to create entity: {e}")
+            logger.error("Failed to create entity: %s", e)
+            raise
+
+    def create_entities_bulk(self, rows):
+        """
+        Create many entities with one multi-row INSERT and a single commit.
+
+        Args:
+            rows: List of dictionaries of create_entity keyword arguments
+
+        Returns:
+            Number of entities created
+        """
+        if not rows:
+            return 0
+
+        try:
+            mappings = [
+                {
+                    'name': row['name'],
+                    'entity_type': normalize_choice(row['entity_type'], ENTITY_TYPES),
+                    'accounting_method': normalize_choice(row.get('accounting_method', 'cash'), ACCOUNTING_METHODS),
+                    'ein': row.get('ein'),
+                    'formation_date': row.get('formation_date'),
+                    'state': row.get('state', 'LA'),
+                    'notes': row.get('notes')
+                }
+                for row in rows
+            ]
+
+            self.session.execute(insert(Entity), mappings)
+            self.session.commit()
+            logger.info("Created %s entities", len(mappings))
+            return len(mappings)
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error("Failed to create entities: %s", e)
             raise
 
     def get_entity(self, entity_id):
@@ -68,40 +127,57 @@ class EntityManager:
         """Get entity by name."""
         return self.session.query(Entity).filter_by(name=name).first()
 
-    def get_all_entities(self, active_only=True):
+    def get_all_entities(self, active_only=True, eager=False):
         """
         Get all entities.
 
         Args:
             active_only: Only return active entities (default True)
+            eager: Also load each entity's assets and transactions
 
         Returns:
             List of Entity objects
         """
-        query = self.session.query(Entity)
+        query = self._entity_query(eager)
         if active_only:
             query = query.filter_by(active=True)
         return query.all()
 
-    def get_entities_by_type(self, entity_type, active_only=True):
+    def get_entities_by_type(self, entity_type, active_only=True, eager=False):
         """
         Get entities by type.
 
         Args:
             entity_type: Entity type to filter by
             active_only: Only return active entities
+            eager: Also load each entity's assets and transactions
 
         Returns:
             List of Entity objects
         """
-        if isinstance(entity_type, str):
-            entity_type = EntityType[entity_type.upper()]
+        entity_type = normalize_choice(entity_type, ENTITY_TYPES)
 
-        query = self.session.query(Entity).filter_by(entity_type=entity_type)
+        query = self._entity_query(eager).filter_by(entity_type=entity_type)
         if active_only:
             query = query.filter_by(active=True)
         return query.all()
 
+    def _entity_query(self, eager):
+        """
+        Build the base Entity query.
+
+        With eager, assets and transactions are loaded with one SELECT ... IN
+        per relationship instead of one lazy load per entity, and already
+        loaded entities are refreshed so their collections are current.
+        """
+        query = self.session.query(Entity)
+        if eager:
+            query = query.options(
+                selectinload(Entity.assets),
+                selectinload(Entity.transactions)
+            ).execution_options(populate_existing=True)
+        return query
+
     def update_entity(self, entity_id, **kwargs):
         """
         Update entity attributes.
@@ -122,14 +198,14 @@ class EntityManager:
                 if hasattr(entity, key):
                     setattr(entity, key, value)
 
-            entity.updated_at = datetime.utcnow()
+            entity.updated_at = datetime.now(timezone.utc).replace(tzinfo=None)
             self.session.commit()
-            logger.info(f"Updated entity: {entity.name}")
+            logger.info("Updated entity: %s", entity.name)
             return entity
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Failed to update entity: {e}")
+            logger.error("Failed to update entity: %s", e)
             raise
 
     def deactivate_entity(self, entity_id):
@@ -153,39 +229,80 @@ class EntityManager:
             name = entity.name
             self.session.delete(entity)
             self.session.commit()
-            logger.warning(f"Deleted entity: {name}")
+            logger.warning("Deleted entity: %s", name)
             return True
 
         except Exception as e:
             self.session.rollback()
-            logger.error(f"Failed to delete entity: {e}")
+            logger.error("Failed to delete entity: %s", e)
             raise
 
     def get_entity_summary(self, entity_id):
         """
         Get summary information for an entity.
 
+        Asset and transaction counts are SQL COUNTs, so the entity's
+        collections are never loaded.
+
         Returns:
             Dictionary with entity details and counts
         """
-        entity = self.get_entity(entity_id)
-        if not entity:
+        row = self._summary_query().filter(Entity.id == entity_id).first()
+        if not row:
             return None
 
+        return self._summary(*row)
+
+    def get_all_entities_with_summary(self, active_only=True):
+        """
+        Get summary information for all entities.
+
+        Asset and transaction counts come from correlated subqueries in the
+        same SELECT, so no per-entity queries or collection loads are needed.
+
+        Args:
+            active_only: Only return active entities (default True)
+
+        Returns:
+            List of summary dictionaries (see get_entity_summary)
+        """
+        query = self._summary_query()
+        if active_only:
+            query = query.filter(Entity.active == True)
+
+        return [
+            self._summary(entity, assets, transactions)
+            for entity, assets, transactions in query.order_by(Entity.id)
+        ]
+
+    def _summary_query(self):
+        """Query entities with their asset and transaction counts as correlated subqueries."""
+        asset_count = select(func.count(Asset.id)).where(
+            Asset.entity_id == Entity.id
+        ).correlate(Entity).scalar_subquery()
+        transaction_count = select(func.count(Transaction.id)).where(
+            Transaction.entity_id == Entity.id
+        ).correlate(Entity).scalar_subquery()
+
+        return self.session.query(Entity, asset_count, transaction_count)
+
+    def _summary(self, entity, asset_count, transaction_count):
+        """Build the summary dictionary for an entity."""
         return {
             'id': entity.id,
             'name': entity.name,
-            'type': entity.entity_type.value,
-            'accounting_method': entity.accounting_method.value,
+            'type': entity.entity_type,
+            'accounting_method': entity.accounting_method,
             'ein': entity.ein,
             'state': entity.state,
             'active': entity.active,
-            'asset_count': len(entity.assets),
-            'transaction_count': len(entity.transactions),
+            'asset_count': asset_count,
+            'transaction_count': transaction_count,
             'created_at': entity.created_at,
             'notes': entity.notes
         }
 
     def close(self):
-        """Close database session."""
-        self.session.close()
+        """Close database session (only if this manager opened it)."""
+        if self._owns_session:
+            self.session.close()
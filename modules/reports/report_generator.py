@@ -7,8 +7,34 @@ from pathlib import Path
 import json
 import logging
 
+import numpy as np
+
+from config.settings import ensure_dirs
+
 logger = logging.getLogger(__name__)
 
+# Report rules and line formats, built once instead of per report line
+_RULE_80 = "=" * 80
+_DASH_80 = "-" * 80
+_RULE_100 = "=" * 100
+_DASH_100 = "-" * 100
+_LINE_ITEM = "  {:<50} ${:>15,.2f}".format
+_SUB_ITEM = "    {:<48} ${:>15,.2f}".format
+_ASSET_ROW = "{:<30} {:<10} ${:>14,.2f} ${:>14,.2f} ${:>14,.2f} ${:>14,.2f}".format
+_ASSET_HEADER = f"{'Description':<30} {'Class':<10} {'Section 179':>15} {'Bonus':>15} {'MACRS':>15} {'Total':>15}"
+
+
+def _timestamp():
+    """Format the current time for a report's Generated line."""
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _json_default(value):
+    """Serialize NumPy values as plain numbers/lists and anything else as str."""
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    return str(value)
+
 
 class ReportGenerator:
     """Generate tax reports and summaries."""
@@ -20,11 +46,12 @@ class ReportGenerator:
         Args:
             output_dir: Directory to save reports
         """
+        ensure_dirs()
         self.output_dir = Path(output_dir)
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
     def generate_schedule_f_summary(self, entity_name, tax_year, income_summary,
-                                    expense_summary, depreciation, net_profit):
+                                    expense_summary, depreciation, net_profit, generated_at=None):
         """
         Generate Schedule F summary report.
 
@@ -35,60 +62,65 @@ class ReportGenerator:
             expense_summary: Expense summary dict
             depreciation: Total depreciation
             net_profit: Net farm profit
+            generated_at: Timestamp text for the Generated line (default: now)
 
         Returns:
             Report text
         """
-        report = []
-        report.append("=" * 80)
-        report.append(f"SCHEDULE F - PROFIT OR LOSS FROM FARMING")
-        report.append(f"Entity: {entity_name}")
-        report.append(f"Tax Year: {tax_year}")
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("=" * 80)
-        report.append("")
+        return "\n".join(self.iter_schedule_f_summary(
+            entity_name, tax_year, income_summary, expense_summary, depreciation, net_profit, generated_at
+        ))
+
+    def iter_schedule_f_summary(self, entity_name, tax_year, income_summary, expense_summary,
+                                depreciation, net_profit, generated_at=None):
+        """Yield the lines of generate_schedule_f_summary."""
+        yield _RULE_80
+        yield f"SCHEDULE F - PROFIT OR LOSS FROM FARMING"
+        yield f"Entity: {entity_name}"
+        yield f"Tax Year: {tax_year}"
+        yield f"Generated: {generated_at or _timestamp()}"
+        yield _RULE_80
+        yield ""
 
         # PART I - FARM INCOME
-        report.append("PART I - FARM INCOME")
-        report.append("-" * 80)
+        yield "PART I - FARM INCOME"
+        yield _DASH_80
 
         total_income = 0.0
         for category, amount in income_summary.get('by_category', {}).items():
             category_display = category.replace('_', ' ').title()
-            report.append(f"  {category_display:<50} ${amount:>15,.2f}")
+            yield _LINE_ITEM(category_display, amount)
             total_income += amount
 
-        report.append("-" * 80)
-        report.append(f"  {'TOTAL INCOME':<50} ${total_income:>15,.2f}")
-        report.append("")
+        yield _DASH_80
+        yield _LINE_ITEM('TOTAL INCOME', total_income)
+        yield ""
 
         # PART II - FARM EXPENSES
-        report.append("PART II - FARM EXPENSES")
-        report.append("-" * 80)
+        yield "PART II - FARM EXPENSES"
+        yield _DASH_80
 
         total_expenses = 0.0
         for category, amount in expense_summary.get('by_category', {}).items():
             category_display = category.replace('_', ' ').title()
-            report.append(f"  {category_display:<50} ${amount:>15,.2f}")
+            yield _LINE_ITEM(category_display, amount)
             total_expenses += amount
 
         # Add depreciation
-        report.append(f"  {'Depreciation':<50} ${depreciation:>15,.2f}")
+        yield _LINE_ITEM('Depreciation', depreciation)
         total_expenses += depreciation
 
-        report.append("-" * 80)
-        report.append(f"  {'TOTAL EXPENSES':<50} ${total_expenses:>15,.2f}")
-        report.append("")
+        yield _DASH_80
+        yield _LINE_ITEM('TOTAL EXPENSES', total_expenses)
+        yield ""
 
         # PART III - NET PROFIT OR LOSS
-        report.append("PART III - NET FARM PROFIT OR (LOSS)")
-        report.append("-" * 80)
-        report.append(f"  {'Net Farm Profit (Loss)':<50} ${net_profit:>15,.2f}")
-        report.append("=" * 80)
+        yield "PART III - NET FARM PROFIT OR (LOSS)"
+        yield _DASH_80
+        yield _LINE_ITEM('Net Farm Profit (Loss)', net_profit)
+        yield _RULE_80
 
-        return "\n".join(report)
-
-    def generate_depreciation_report(self, entity_name, tax_year, assets_depreciation):
+    def generate_depreciation_report(self, entity_name, tax_year, assets_depreciation, generated_at=None):
         """
         Generate Form 4562 depreciation summary.
 
@@ -96,18 +128,22 @@ class ReportGenerator:
             entity_name: Entity name
             tax_year: Tax year
             assets_depreciation: List of asset depreciation details
+            generated_at: Timestamp text for the Generated line (default: now)
 
         Returns:
             Report text
         """
-        report = []
-        report.append("=" * 100)
-        report.append(f"FORM 4562 - DEPRECIATION AND AMORTIZATION")
-        report.append(f"Entity: {entity_name}")
-        report.append(f"Tax Year: {tax_year}")
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("=" * 100)
-        report.append("")
+        return "\n".join(self.iter_depreciation_report(entity_name, tax_year, assets_depreciation, generated_at))
+
+    def iter_depreciation_report(self, entity_name, tax_year, assets_depreciation, generated_at=None):
+        """Yield the lines of generate_depreciation_report."""
+        yield _RULE_100
+        yield f"FORM 4562 - DEPRECIATION AND AMORTIZATION"
+        yield f"Entity: {entity_name}"
+        yield f"Tax Year: {tax_year}"
+        yield f"Generated: {generated_at or _timestamp()}"
+        yield _RULE_100
+        yield ""
 
         # Summary totals
         total_section_179 = 0.0
@@ -115,10 +151,10 @@ class ReportGenerator:
         total_macrs = 0.0
 
         # Asset details
-        report.append("ASSET DEPRECIATION DETAILS")
-        report.append("-" * 100)
-        report.append(f"{'Description':<30} {'Class':<10} {'Section 179':>15} {'Bonus':>15} {'MACRS':>15} {'Total':>15}")
-        report.append("-" * 100)
+        yield "ASSET DEPRECIATION DETAILS"
+        yield _DASH_100
+        yield _ASSET_HEADER
+        yield _DASH_100
 
         for asset in assets_depreciation:
             desc = asset.get('description', '')[:28]
@@ -128,90 +164,91 @@ class ReportGenerator:
             macrs = asset.get('macrs_depreciation', 0.0)
             total = s179 + bonus + macrs
 
-            report.append(f"{desc:<30} {macrs_class:<10} ${s179:>14,.2f} ${bonus:>14,.2f} ${macrs:>14,.2f} ${total:>14,.2f}")
+            yield _ASSET_ROW(desc, macrs_class, s179, bonus, macrs, total)
 
             total_section_179 += s179
             total_bonus += bonus
             total_macrs += macrs
 
-        report.append("-" * 100)
-        report.append(f"{'TOTALS':<30} {'':<10} ${total_section_179:>14,.2f} ${total_bonus:>14,.2f} ${total_macrs:>14,.2f} ${total_section_179 + total_bonus + total_macrs:>14,.2f}")
-        report.append("=" * 100)
-
-        return "\n".join(report)
+        yield _DASH_100
+        yield _ASSET_ROW('TOTALS', '', total_section_179, total_bonus, total_macrs,
+                         total_section_179 + total_bonus + total_macrs)
+        yield _RULE_100
 
-    def generate_tax_projection_report(self, tax_year, combined_tax_calc):
+    def generate_tax_projection_report(self, tax_year, combined_tax_calc, generated_at=None):
         """
         Generate tax projection/liability report.
 
         Args:
             tax_year: Tax year
             combined_tax_calc: Combined tax calculation dict
+            generated_at: Timestamp text for the Generated line (default: now)
 
         Returns:
             Report text
         """
-        report = []
-        report.append("=" * 80)
-        report.append(f"TAX PROJECTION AND LIABILITY SUMMARY")
-        report.append(f"Tax Year: {tax_year}")
-        report.append(f"Filing Status: {combined_tax_calc.get('filing_status', '').replace('_', ' ').title()}")
-        report.append(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        report.append("=" * 80)
-        report.append("")
+        return "\n".join(self.iter_tax_projection_report(tax_year, combined_tax_calc, generated_at))
+
+    def iter_tax_projection_report(self, tax_year, combined_tax_calc, generated_at=None):
+        """Yield the lines of generate_tax_projection_report."""
+        yield _RULE_80
+        yield f"TAX PROJECTION AND LIABILITY SUMMARY"
+        yield f"Tax Year: {tax_year}"
+        yield f"Filing Status: {combined_tax_calc.get('filing_status', '').replace('_', ' ').title()}"
+        yield f"Generated: {generated_at or _timestamp()}"
+        yield _RULE_80
+        yield ""
 
         # Farm income summary
-        report.append("FARM INCOME SUMMARY")
-        report.append("-" * 80)
-        report.append(f"  {'Gross Farm Income':<50} ${combined_tax_calc.get('farm_income', 0):>15,.2f}")
-        report.append(f"  {'Farm Expenses':<50} ${combined_tax_calc.get('farm_expenses', 0):>15,.2f}")
-        report.append(f"  {'Depreciation':<50} ${combined_tax_calc.get('depreciation', 0):>15,.2f}")
-        report.append(f"  {'Net Farm Profit':<50} ${combined_tax_calc.get('net_farm_profit', 0):>15,.2f}")
-        report.append(f"  {'Other Income':<50} ${combined_tax_calc.get('other_income', 0):>15,.2f}")
-        report.append(f"  {'Adjusted Gross Income (AGI)':<50} ${combined_tax_calc.get('agi', 0):>15,.2f}")
-        report.append("")
+        yield "FARM INCOME SUMMARY"
+        yield _DASH_80
+        yield _LINE_ITEM('Gross Farm Income', combined_tax_calc.get('farm_income', 0))
+        yield _LINE_ITEM('Farm Expenses', combined_tax_calc.get('farm_expenses', 0))
+        yield _LINE_ITEM('Depreciation', combined_tax_calc.get('depreciation', 0))
+        yield _LINE_ITEM('Net Farm Profit', combined_tax_calc.get('net_farm_profit', 0))
+        yield _LINE_ITEM('Other Income', combined_tax_calc.get('other_income', 0))
+        yield _LINE_ITEM('Adjusted Gross Income (AGI)', combined_tax_calc.get('agi', 0))
+        yield ""
 
         # Federal tax
         federal = combined_tax_calc.get('federal_tax', {})
         se_tax = federal.get('self_employment_tax', {})
 
-        report.append("FEDERAL TAX")
-        report.append("-" * 80)
-        report.append(f"  {'Self-Employment Tax:':<50}")
-        report.append(f"    {'Social Security':<48} ${se_tax.get('social_security_tax', 0):>15,.2f}")
-        report.append(f"    {'Medicare':<48} ${se_tax.get('medicare_tax', 0):>15,.2f}")
-        report.append(f"    {'Total SE Tax':<48} ${se_tax.get('total_se_tax', 0):>15,.2f}")
-        report.append("")
-        report.append(f"  {'Taxable Income':<50} ${federal.get('taxable_income', 0):>15,.2f}")
+        yield "FEDERAL TAX"
+        yield _DASH_80
+        yield f"  {'Self-Employment Tax:':<50}"
+        yield _SUB_ITEM('Social Security', se_tax.get('social_security_tax', 0))
+        yield _SUB_ITEM('Medicare', se_tax.get('medicare_tax', 0))
+        yield _SUB_ITEM('Total SE Tax', se_tax.get('total_se_tax', 0))
+        yield ""
+        yield _LINE_ITEM('Taxable Income', federal.get('taxable_income', 0))
         income_tax = federal.get('income_tax', {})
-        report.append(f"  {'Income Tax':<50} ${income_tax.get('total_tax', 0):>15,.2f}")
-        report.append(f"  {'Total Federal Tax':<50} ${combined_tax_calc.get('total_federal_tax', 0):>15,.2f}")
-        report.append("")
+        yield _LINE_ITEM('Income Tax', income_tax.get('total_tax', 0))
+        yield _LINE_ITEM('Total Federal Tax', combined_tax_calc.get('total_federal_tax', 0))
+        yield ""
 
         # Louisiana tax
         la_tax = combined_tax_calc.get('louisiana_tax', {})
         la_calc = la_tax.get('tax_calculation', {})
 
-        report.append("LOUISIANA STATE TAX")
-        report.append("-" * 80)
-        report.append(f"  {'Louisiana AGI':<50} ${la_calc.get('louisiana_agi', 0):>15,.2f}")
-        report.append(f"  {'Deductions':<50} ${la_calc.get('deduction_amount', 0):>15,.2f}")
-        report.append(f"  {'Exemptions':<50} ${la_calc.get('total_exemptions', 0):>15,.2f}")
-        report.append(f"  {'Taxable Income':<50} ${la_calc.get('taxable_income', 0):>15,.2f}")
-        report.append(f"  {'Louisiana Income Tax':<50} ${combined_tax_calc.get('total_louisiana_tax', 0):>15,.2f}")
-        report.append("")
+        yield "LOUISIANA STATE TAX"
+        yield _DASH_80
+        yield _LINE_ITEM('Louisiana AGI', la_calc.get('louisiana_agi', 0))
+        yield _LINE_ITEM('Deductions', la_calc.get('deduction_amount', 0))
+        yield _LINE_ITEM('Exemptions', la_calc.get('total_exemptions', 0))
+        yield _LINE_ITEM('Taxable Income', la_calc.get('taxable_income', 0))
+        yield _LINE_ITEM('Louisiana Income Tax', combined_tax_calc.get('total_louisiana_tax', 0))
+        yield ""
 
         # Total
-        report.append("TOTAL TAX LIABILITY")
-        report.append("=" * 80)
-        report.append(f"  {'Total Federal Tax':<50} ${combined_tax_calc.get('total_federal_tax', 0):>15,.2f}")
-        report.append(f"  {'Total Louisiana Tax':<50} ${combined_tax_calc.get('total_louisiana_tax', 0):>15,.2f}")
-        report.append("-" * 80)
-        report.append(f"  {'TOTAL TAX LIABILITY':<50} ${combined_tax_calc.get('total_tax_liability', 0):>15,.2f}")
-        report.append(f"  {'Combined Effective Rate':<50} {combined_tax_calc.get('combined_effective_rate_percent', '0.00%'):>16}")
-        report.append("=" * 80)
-
-        return "\n".join(report)
+        yield "TOTAL TAX LIABILITY"
+        yield _RULE_80
+        yield _LINE_ITEM('Total Federal Tax', combined_tax_calc.get('total_federal_tax', 0))
+        yield _LINE_ITEM('Total Louisiana Tax', combined_tax_calc.get('total_louisiana_tax', 0))
+        yield _DASH_80
+        yield _LINE_ITEM('TOTAL TAX LIABILITY', combined_tax_calc.get('total_tax_liability', 0))
+        yield f"  {'Combined Effective Rate':<50} {combined_tax_calc.get('combined_effective_rate_percent', '0.00%'):>16}"
+        yield _RULE_80
 
     def save_report(self, filename, content):
         """
@@ -227,12 +264,44 @@ class ReportGenerator:
         filepath = self.output_dir / filename
 
         try:
-            with open(filepath, 'w') as f:
-                f.write(content)
-            logger.info(f"Report saved to: {filepath}")
+            # Encode once and write the whole report in a single binary write
+            data = content.encode('utf-8')
+            with open(filepath, 'wb') as f:
+                f.write(data)
+            logger.info("Report saved to: %s", filepath)
+            return filepath
+        except Exception as e:
+            logger.error("Failed to save report: %s", e)
+            raise
+
+    def save_report_stream(self, filename, lines):
+        """
+        Save report lines to file as they are produced.
+
+        Writes the same file as save_report("\n".join(lines)) without
+        holding the whole report in memory; pass one of the iter_* report
+        methods.
+
+        Args:
+            filename: Filename (without path)
+            lines: Iterable of report lines (without newlines)
+
+        Returns:
+            Path to saved file
+        """
+        filepath = self.output_dir / filename
+
+        try:
+            with open(filepath, 'w', encoding='utf-8', newline='', buffering=256 * 1024) as f:
+                separator = ''
+                for line in lines:
+                    f.write(separator)
+                    f.write(line)
+                    separator = '\n'
+            logger.info("Report saved to: %s", filepath)
             return filepath
         except Exception as e:
-            logger.error(f"Failed to save report: {e}")
+            logger.error("Failed to save report: %s", e)
             raise
 
     def save_json_report(self, filename, data):
@@ -249,10 +318,13 @@ class ReportGenerator:
         filepath = self.output_dir / filename
 
         try:
-            with open(filepath, 'w') as f:
-                json.dump(data, f, indent=2, default=str)
-            logger.info(f"JSON report saved to: {filepath}")
+            # json.dumps joins the encoded chunks once; json.dump would
+            # issue a file write per chunk
+            content = json.dumps(data, indent=2, default=_json_default).encode('utf-8')
+            with open(filepath, 'wb') as f:
+                f.write(content)
+            logger.info("JSON report saved to: %s", filepath)
             return filepath
         except Exception as e:
-            logger.error(f"Failed to save JSON report: {e}")
+            logger.error("Failed to save JSON report: %s", e)
             raise
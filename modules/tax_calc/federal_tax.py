@@ -13,9 +13,31 @@ from config.tax_constants import (
     ADDITIONAL_MEDICARE_TAX_RATE,
     FARM_INCOME_AVERAGING_YEARS
 )
-import logging
-
-logger = logging.getLogger(__name__)
+from config.tax_math import bracket_amounts, bracket_rows, compute_tax
+from functools import lru_cache
+from types import MappingProxyType
+import numpy as np
+
+# SE tax result fields when there are no net earnings
+_ZERO_SE_TAX = MappingProxyType({
+    'net_earnings': 0.0,
+    'social_security_tax': 0.0,
+    'medicare_tax': 0.0,
+    'additional_medicare_tax': 0.0,
+    'total_se_tax': 0.0,
+    'deductible_se_tax': 0.0
+})
+
+# One record per scenario for calculate_se_tax_array; field names match
+# the keys of calculate_self_employment_tax's result
+SE_TAX_DTYPE = np.dtype([
+    ('net_earnings', 'f8'),
+    ('social_security_tax', 'f8'),
+    ('medicare_tax', 'f8'),
+    ('additional_medicare_tax', 'f8'),
+    ('total_se_tax', 'f8'),
+    ('deductible_se_tax', 'f8'),
+])
 
 
 class FederalTaxCalculator:
@@ -34,6 +56,13 @@ class FederalTaxCalculator:
         self.tax_brackets = get_tax_brackets(filing_status, tax_year)
         self.standard_deduction = get_standard_deduction(filing_status, tax_year)
 
+        # Per-instance constants so the hot paths read attributes, not dicts
+        self._bracket_rows = bracket_rows(filing_status)
+        if filing_status == 'married_filing_jointly':
+            self._se_threshold = ADDITIONAL_MEDICARE_TAX_THRESHOLD_MFJ
+        else:
+            self._se_threshold = 200000  # Single/other
+
     def calculate_self_employment_tax(self, net_farm_profit):
         """
         Calculate self-employment tax.
@@ -52,18 +81,11 @@ class FederalTaxCalculator:
         net_earnings = net_farm_profit * SELF_EMPLOYMENT_DEDUCTION  # 92.35%
 
         if net_earnings <= 0:
-            return {
-                'net_farm_profit': net_farm_profit,
-                'net_earnings': 0.0,
-                'social_security_tax': 0.0,
-                'medicare_tax': 0.0,
-                'additional_medicare_tax': 0.0,
-                'total_se_tax': 0.0,
-                'deductible_se_tax': 0.0
-            }
+            return {'net_farm_profit': net_farm_profit, **_ZERO_SE_TAX}
 
         # Social Security tax (12.4% up to wage base)
-        social_security_base = min(net_earnings, SOCIAL_SECURITY_WAGE_BASE_2024)
+        social_security_base = (net_earnings if net_earnings < SOCIAL_SECURITY_WAGE_BASE_2024
+                                else SOCIAL_SECURITY_WAGE_BASE_2024)
         social_security_tax = social_security_base * 0.124
 
         # Medicare tax (2.9% on all earnings)
@@ -71,11 +93,7 @@ class FederalTaxCalculator:
 
         # Additional Medicare tax (0.9% over threshold for high earners)
         additional_medicare_tax = 0.0
-        if self.filing_status == 'married_filing_jointly':
-            threshold = ADDITIONAL_MEDICARE_TAX_THRESHOLD_MFJ
-        else:
-            threshold = 200000  # Single/other
-
+        threshold = self._se_threshold
         if net_earnings > threshold:
             additional_medicare_tax = (net_earnings - threshold) * ADDITIONAL_MEDICARE_TAX_RATE
 
@@ -96,68 +114,109 @@ class FederalTaxCalculator:
             'deductible_se_tax': deductible_se_tax
         }
 
-    def calculate_income_tax(self, taxable_income):
+    def calculate_se_tax_array(self, net_farm_profits):
+        """
+        Calculate self-employment tax for many net profits at once.
+
+        Same rules as calculate_self_employment_tax, applied with array
+        operations; profits with no net earnings get all zeros.
+
+        Args:
+            net_farm_profits: Sequence of net farm profits
+
+        Returns:
+            Structured ndarray of SE_TAX_DTYPE, one record per profit
+        """
+        profits = np.asarray(net_farm_profits, dtype=np.float64)
+        net_earnings = profits * SELF_EMPLOYMENT_DEDUCTION
+        has_earnings = net_earnings > 0
+        threshold = self._se_threshold
+
+        social_security_tax = np.minimum(net_earnings, SOCIAL_SECURITY_WAGE_BASE_2024) * 0.124
+        medicare_tax = net_earnings * 0.029
+        additional_medicare_tax = np.where(
+            net_earnings > threshold, (net_earnings - threshold) * ADDITIONAL_MEDICARE_TAX_RATE, 0.0
+        )
+        total_se_tax = social_security_tax + medicare_tax + additional_medicare_tax
+
+        result = np.zeros(profits.shape, dtype=SE_TAX_DTYPE)
+        result['net_earnings'] = np.where(has_earnings, net_earnings, 0.0)
+        result['social_security_tax'] = np.where(has_earnings, social_security_tax, 0.0)
+        result['medicare_tax'] = np.where(has_earnings, medicare_tax, 0.0)
+        result['additional_medicare_tax'] = np.where(has_earnings, additional_medicare_tax, 0.0)
+        result['total_se_tax'] = np.where(has_earnings, total_se_tax, 0.0)
+        result['deductible_se_tax'] = result['total_se_tax'] * 0.50
+        return result
+
+    def calculate_income_tax(self, taxable_income, verbose=True):
         """
         Calculate federal income tax using tax brackets.
 
         Args:
             taxable_income: Taxable income after deductions
+            verbose: Include the per-bracket 'brackets_used' breakdown
 
         Returns:
             Dictionary with income tax calculation
         """
         if taxable_income <= 0:
-            return {
+            result = {
                 'taxable_income': 0.0,
                 'total_tax': 0.0,
-                'effective_rate': 0.0,
-                'brackets_used': []
+                'effective_rate': 0.0
             }
+            if verbose:
+                result['brackets_used'] = []
+            return result
 
-        total_tax = 0.0
-        brackets_used = []
-        remaining_income = taxable_income
-
-        for bracket in self.tax_brackets:
-            bracket_min = bracket['min']
-            bracket_max = bracket['max']
-            rate = bracket['rate']
-
-            # Calculate income in this bracket
-            if remaining_income <= 0:
-                break
-
-            if taxable_income > bracket_min:
-                # Income falls in this bracket
-                taxable_in_bracket = min(
-                    remaining_income,
-                    bracket_max - bracket_min
-                )
-                tax_in_bracket = taxable_in_bracket * rate
-
-                brackets_used.append({
-                    'min': bracket_min,
-                    'max': bracket_max,
-                    'rate': rate,
-                    'taxable_amount': taxable_in_bracket,
-                    'tax': tax_in_bracket
-                })
-
-                total_tax += tax_in_bracket
-                remaining_income -= taxable_in_bracket
-
+        total_tax = compute_tax(taxable_income, self.filing_status)
         effective_rate = (total_tax / taxable_income) if taxable_income > 0 else 0.0
 
-        return {
+        result = {
             'taxable_income': taxable_income,
             'total_tax': total_tax,
-            'effective_rate': effective_rate,
-            'brackets_used': brackets_used
+            'effective_rate': effective_rate
         }
+        if verbose:
+            result['brackets_used'] = self._brackets_used(taxable_income)
+        return result
+
+    def _brackets_used(self, taxable_income):
+        """
+        Break taxable income down by bracket for display.
+
+        Amounts for all brackets come from one array operation; empty
+        brackets are dropped.
+        """
+        return [
+            {
+                'min': bracket_min,
+                'max': bracket_max,
+                'rate': rate,
+                'taxable_amount': taxable_in_bracket,
+                'tax': taxable_in_bracket * rate
+            }
+            for (bracket_min, bracket_max, rate), taxable_in_bracket in zip(
+                self._bracket_rows, bracket_amounts(taxable_income, self.filing_status).tolist()
+            )
+            if taxable_in_bracket > 0
+        ]
+
+    def calculate_income_tax_array(self, taxable_incomes):
+        """
+        Calculate federal income tax for many taxable incomes at once.
+
+        Args:
+            taxable_incomes: Sequence of taxable incomes (<= 0 owes no tax)
+
+        Returns:
+            ndarray of income tax, one per income
+        """
+        return compute_tax(np.asarray(taxable_incomes, dtype=np.float64), self.filing_status)
 
     def calculate_farm_tax_liability(self, total_income, total_expenses, depreciation,
                                     other_income=0.0, itemized_deductions=0.0,
-                                    exemptions=0, use_standard_deduction=True):
+                                    exemptions=0, use_standard_deduction=True, verbose=True):
         """
         Calculate complete federal tax liability for farm operation.
 
@@ -169,6 +228,7 @@ class FederalTaxCalculator:
             itemized_deductions: Itemized deductions (if not using standard deduction)
             exemptions: Number of exemptions/dependents
             use_standard_deduction: Use standard deduction vs itemized
+            verbose: Include the income tax 'brackets_used' breakdown
 
         Returns:
             Complete tax calculation dictionary
@@ -192,10 +252,12 @@ class FederalTaxCalculator:
             deduction_type = 'itemized'
 
         # Calculate taxable income
-        taxable_income = max(0, agi - deduction)
+        taxable_income = agi - deduction
+        if taxable_income < 0:
+            taxable_income = 0
 
         # Calculate income tax
-        income_tax_calc = self.calculate_income_tax(taxable_income)
+        income_tax_calc = self.calculate_income_tax(taxable_income, verbose=verbose)
 
         # Total federal tax liability
         total_federal_tax = income_tax_calc['total_tax'] + se_tax_calc['total_se_tax']
@@ -239,7 +301,9 @@ class FederalTaxCalculator:
 
         # Calculate elected farm income (amount to average)
         # This is typically the excess of current year over the 3-year average
-        elected_farm_income = max(0, current_year_income - avg_prior_income)
+        elected_farm_income = current_year_income - avg_prior_income
+        if elected_farm_income < 0:
+            elected_farm_income = 0
 
         # Allocate elected farm income to prior 3 years
         allocated_to_each_year = elected_farm_income / 3
@@ -253,6 +317,41 @@ class FederalTaxCalculator:
             'note': 'This calculation provides the basics. Complete Schedule J calculation requires prior year tax returns.'
         }
 
+    def calculate_farm_income_averaging_series(self, incomes):
+        """
+        Calculate farm income averaging for every year of an income history.
+
+        Each year from the fourth onward is averaged against the 3 years
+        before it, using the same rules as calculate_farm_income_averaging.
+
+        Args:
+            incomes: Net farm income per year, oldest first (at least 4 years)
+
+        Returns:
+            Dictionary of ndarrays, one entry per averaged year
+        """
+        incomes = np.asarray(incomes, dtype=np.float64)
+        years = FARM_INCOME_AVERAGING_YEARS
+        if incomes.ndim != 1 or len(incomes) <= years:
+            raise ValueError(f"Must provide at least {years + 1} years of income")
+
+        # Trailing 3-year sums, added in the same order as the scalar sum()
+        num_years = len(incomes)
+        prior_sum = incomes[0:num_years - years].copy()
+        for offset in range(1, years):
+            prior_sum += incomes[offset:num_years - years + offset]
+        avg_prior_income = prior_sum / years
+
+        current_year_income = incomes[years:]
+        elected_farm_income = np.maximum(current_year_income - avg_prior_income, 0.0)
+
+        return {
+            'current_year_income': current_year_income,
+            'average_prior_income': avg_prior_income,
+            'elected_farm_income': elected_farm_income,
+            'allocated_per_year': elected_farm_income / years
+        }
+
     def estimate_quarterly_taxes(self, estimated_annual_tax, payments_made=None):
         """
         Estimate quarterly tax payments.
@@ -268,10 +367,17 @@ class FederalTaxCalculator:
             payments_made = [0, 0, 0, 0]
 
         quarterly_amount = estimated_annual_tax / 4
-        total_paid = sum(payments_made)
+
+        # Total and count of quarters paid in one pass
+        total_paid = 0
+        quarters_paid = 0
+        for payment in payments_made:
+            total_paid += payment
+            if payment > 0:
+                quarters_paid += 1
         remaining = max(0, estimated_annual_tax - total_paid)
 
-        quarters_remaining = 4 - len([p for p in payments_made if p > 0])
+        quarters_remaining = 4 - quarters_paid
         if quarters_remaining > 0:
             recommended_next_payment = remaining / quarters_remaining
         else:
@@ -291,3 +397,21 @@ class FederalTaxCalculator:
                 'Q4': quarterly_amount
             }
         }
+
+
+@lru_cache(maxsize=32)
+def get_federal_calculator(filing_status='married_filing_jointly', tax_year=2024):
+    """
+    Get a shared FederalTaxCalculator for a filing status and tax year.
+
+    Calculators hold no state beyond their constructor arguments, so one
+    instance per (filing_status, tax_year) is reused across calls.
+
+    Args:
+        filing_status: Filing status
+        tax_year: Tax year
+
+    Returns:
+        FederalTaxCalculator instance (shared; do not modify)
+    """
+    return FederalTaxCalculator(filing_status, tax_year)
@@ -9,9 +9,35 @@ from config.tax_constants import (
     LA_DEPENDENT_EXEMPTION_2024,
     LA_ALLOWS_FEDERAL_ITEMIZED_DEDUCTION
 )
-import logging
+from config.tax_math import bracket_amounts, bracket_rows, compute_tax
+from functools import lru_cache
+import numpy as np
+
+# (min, max, rate, rate label) per Louisiana bracket; labels are formatted
+# once at import
+_LA_BRACKET_ROWS = tuple(
+    (bracket_min, bracket_max, rate, f"{rate * 100:.2f}%")
+    for bracket_min, bracket_max, rate in bracket_rows(None, state='LA')
+)
 
-logger = logging.getLogger(__name__)
+# One record per scenario for calculate_combined_tax_batch; field names
+# follow the keys of calculate_combined_tax's result
+COMBINED_TAX_DTYPE = np.dtype([
+    ('farm_income', 'f8'),
+    ('farm_expenses', 'f8'),
+    ('depreciation', 'f8'),
+    ('other_income', 'f8'),
+    ('net_farm_profit', 'f8'),
+    ('total_se_tax', 'f8'),
+    ('agi', 'f8'),
+    ('federal_taxable_income', 'f8'),
+    ('federal_income_tax', 'f8'),
+    ('total_federal_tax', 'f8'),
+    ('louisiana_taxable_income', 'f8'),
+    ('total_louisiana_tax', 'f8'),
+    ('total_tax_liability', 'f8'),
+    ('combined_effective_rate', 'f8'),
+])
 
 
 class LouisianaTaxCalculator:
@@ -28,10 +54,12 @@ class LouisianaTaxCalculator:
         self.filing_status = filing_status
         self.tax_year = tax_year
         self.tax_brackets = LA_TAX_BRACKETS_2024
+        self._bracket_rows = _LA_BRACKET_ROWS
+        self._standard_deduction = LA_STANDARD_DEDUCTION_2024.get(filing_status, 0)
 
     def calculate_louisiana_income_tax(self, louisiana_agi, num_exemptions=2,
                                        num_dependents=0, federal_itemized_deductions=0,
-                                       use_standard_deduction=True):
+                                       use_standard_deduction=True, verbose=True):
         """
         Calculate Louisiana state income tax.
 
@@ -44,18 +72,14 @@ class LouisianaTaxCalculator:
             num_dependents: Number of dependents
             federal_itemized_deductions: Federal itemized deductions (if using)
             use_standard_deduction: Use Louisiana standard deduction vs itemized
+            verbose: Include the per-bracket 'brackets_used' breakdown
 
         Returns:
             Dictionary with Louisiana tax calculation
         """
         # Determine deduction amount
         if use_standard_deduction:
-            if self.filing_status == 'married_filing_jointly':
-                deduction = LA_STANDARD_DEDUCTION_2024['married_filing_jointly']
-            elif self.filing_status == 'single':
-                deduction = LA_STANDARD_DEDUCTION_2024['single']
-            else:
-                deduction = LA_STANDARD_DEDUCTION_2024.get(self.filing_status, 0)
+            deduction = self._standard_deduction
             deduction_type = 'standard'
         else:
             # Louisiana allows federal itemized deductions (with some modifications)
@@ -68,40 +92,16 @@ class LouisianaTaxCalculator:
         total_exemptions = personal_exemptions + dependent_exemptions
 
         # Calculate Louisiana taxable income
-        la_taxable_income = max(0, louisiana_agi - deduction - total_exemptions)
+        la_taxable_income = louisiana_agi - deduction - total_exemptions
+        if la_taxable_income < 0:
+            la_taxable_income = 0
 
         # Calculate Louisiana income tax using brackets
-        total_tax = 0.0
-        brackets_used = []
-
-        for bracket in self.tax_brackets:
-            bracket_min = bracket['min']
-            bracket_max = bracket['max']
-            rate = bracket['rate']
-
-            if la_taxable_income > bracket_min:
-                # Calculate taxable amount in this bracket
-                if la_taxable_income <= bracket_max:
-                    taxable_in_bracket = la_taxable_income - bracket_min
-                else:
-                    taxable_in_bracket = bracket_max - bracket_min
-
-                tax_in_bracket = taxable_in_bracket * rate
-
-                brackets_used.append({
-                    'min': bracket_min,
-                    'max': bracket_max,
-                    'rate': rate,
-                    'rate_percent': f"{rate * 100:.2f}%",
-                    'taxable_amount': taxable_in_bracket,
-                    'tax': tax_in_bracket
-                })
-
-                total_tax += tax_in_bracket
+        total_tax = compute_tax(la_taxable_income, self.filing_status, state='LA')
 
         effective_rate = (total_tax / louisiana_agi) if louisiana_agi > 0 else 0.0
 
-        return {
+        result = {
             'louisiana_agi': louisiana_agi,
             'deduction_type': deduction_type,
             'deduction_amount': deduction,
@@ -111,14 +111,62 @@ class LouisianaTaxCalculator:
             'taxable_income': la_taxable_income,
             'total_tax': total_tax,
             'effective_rate': effective_rate,
-            'effective_rate_percent': f"{effective_rate * 100:.2f}%",
-            'brackets_used': brackets_used
+            'effective_rate_percent': f"{effective_rate * 100:.2f}%" if effective_rate else '0.00%'
         }
+        if verbose:
+            result['brackets_used'] = self._brackets_used(la_taxable_income)
+        return result
+
+    def _brackets_used(self, la_taxable_income):
+        """
+        Break Louisiana taxable income down by bracket for display.
+
+        Amounts for all brackets come from one array operation; empty
+        brackets are dropped.
+        """
+        return [
+            {
+                'min': bracket_min,
+                'max': bracket_max,
+                'rate': rate,
+                'rate_percent': rate_percent,
+                'taxable_amount': taxable_in_bracket,
+                'tax': taxable_in_bracket * rate
+            }
+            for (bracket_min, bracket_max, rate, rate_percent), taxable_in_bracket in zip(
+                self._bracket_rows, bracket_amounts(la_taxable_income, self.filing_status, state='LA').tolist()
+            )
+            if taxable_in_bracket > 0
+        ]
+
+    def calculate_louisiana_income_tax_array(self, louisiana_agis, num_exemptions=2,
+                                             num_dependents=0, federal_itemized_deductions=0,
+                                             use_standard_deduction=True):
+        """
+        Calculate Louisiana income tax for many AGIs at once.
+
+        Same rules as calculate_louisiana_income_tax; exemption and deduction
+        arguments may be scalars or per-scenario arrays.
+
+        Returns:
+            Tuple of (taxable incomes, taxes) as ndarrays
+        """
+        if use_standard_deduction:
+            deduction = self._standard_deduction
+        else:
+            deduction = federal_itemized_deductions if LA_ALLOWS_FEDERAL_ITEMIZED_DEDUCTION else 0
+
+        total_exemptions = (np.asarray(num_exemptions) * LA_PERSONAL_EXEMPTION_2024 +
+                            np.asarray(num_dependents) * LA_DEPENDENT_EXEMPTION_2024)
+        taxable_incomes = np.maximum(
+            0.0, np.asarray(louisiana_agis, dtype=np.float64) - deduction - total_exemptions
+        )
+        return taxable_incomes, compute_tax(taxable_incomes, self.filing_status, state='LA')
 
     def calculate_louisiana_farm_tax(self, net_farm_profit, other_income=0.0,
                                     federal_se_tax_deduction=0.0, num_exemptions=2,
                                     num_dependents=0, use_standard_deduction=True,
-                                    federal_itemized_deductions=0):
+                                    federal_itemized_deductions=0, louisiana_agi=None, verbose=True):
         """
         Calculate Louisiana tax for farm operation.
 
@@ -130,13 +178,19 @@ class LouisianaTaxCalculator:
             num_dependents: Number of dependents
             use_standard_deduction: Use standard deduction
             federal_itemized_deductions: Federal itemized deductions
+            louisiana_agi: Louisiana AGI if already known (e.g., the federal AGI);
+                derived from the other amounts when None
+            verbose: Include the per-bracket 'brackets_used' breakdown
 
         Returns:
             Complete Louisiana tax calculation
         """
         # Calculate Louisiana AGI (similar to federal but may have state-specific adjustments)
         # For most farm operations, Louisiana AGI = Federal AGI
-        la_agi = net_farm_profit + other_income - federal_se_tax_deduction
+        if louisiana_agi is None:
+            la_agi = net_farm_profit + other_income - federal_se_tax_deduction
+        else:
+            la_agi = louisiana_agi
 
         # Calculate Louisiana income tax
         la_tax_calc = self.calculate_louisiana_income_tax(
@@ -144,7 +198,8 @@ class LouisianaTaxCalculator:
             num_exemptions=num_exemptions,
             num_dependents=num_dependents,
             federal_itemized_deductions=federal_itemized_deductions,
-            use_standard_deduction=use_standard_deduction
+            use_standard_deduction=use_standard_deduction,
+            verbose=verbose
         )
 
         return {
@@ -157,21 +212,36 @@ class LouisianaTaxCalculator:
         }
 
 
+@lru_cache(maxsize=32)
+def get_louisiana_calculator(filing_status='married_filing_jointly', tax_year=2024):
+    """
+    Get a shared LouisianaTaxCalculator for a filing status and tax year.
+
+    Args:
+        filing_status: Filing status
+        tax_year: Tax year
+
+    Returns:
+        LouisianaTaxCalculator instance (shared; do not modify)
+    """
+    return LouisianaTaxCalculator(filing_status, tax_year)
+
+
 class CombinedTaxCalculator:
     """Calculate combined federal and Louisiana state taxes."""
 
     def __init__(self, filing_status='married_filing_jointly', tax_year=2024):
         """Initialize combined tax calculator."""
-        from modules.tax_calc.federal_tax import FederalTaxCalculator
+        from modules.tax_calc.federal_tax import get_federal_calculator
 
         self.filing_status = filing_status
         self.tax_year = tax_year
-        self.federal_calc = FederalTaxCalculator(filing_status, tax_year)
-        self.state_calc = LouisianaTaxCalculator(filing_status, tax_year)
+        self.federal_calc = get_federal_calculator(filing_status, tax_year)
+        self.state_calc = get_louisiana_calculator(filing_status, tax_year)
 
     def calculate_combined_tax(self, total_income, total_expenses, depreciation,
                                other_income=0.0, num_exemptions=2, num_dependents=0,
-                               use_standard_deduction=True, itemized_deductions=0):
+                               use_standard_deduction=True, itemized_deductions=0, verbose=False):
         """
         Calculate combined federal and Louisiana state tax.
 
@@ -184,6 +254,7 @@ class CombinedTaxCalculator:
             num_dependents: Dependents
             use_standard_deduction: Use standard deduction
             itemized_deductions: Itemized deductions (if not using standard)
+            verbose: Include the federal and Louisiana 'brackets_used' breakdowns
 
         Returns:
             Complete tax calculation for both federal and state
@@ -195,10 +266,13 @@ class CombinedTaxCalculator:
             depreciation=depreciation,
             other_income=other_income,
             itemized_deductions=itemized_deductions,
-            use_standard_deduction=use_standard_deduction
+            use_standard_deduction=use_standard_deduction,
+            verbose=verbose
         )
 
-        # Calculate Louisiana tax
+        # Calculate Louisiana tax; Louisiana AGI is the federal AGI, so it is
+        # passed through rather than re-derived
+        agi = federal_calc['agi']
         la_calc = self.state_calc.calculate_louisiana_farm_tax(
             net_farm_profit=federal_calc['net_farm_profit'],
             other_income=other_income,
@@ -206,12 +280,14 @@ class CombinedTaxCalculator:
             num_exemptions=num_exemptions,
             num_dependents=num_dependents,
             use_standard_deduction=use_standard_deduction,
-            federal_itemized_deductions=itemized_deductions
+            federal_itemized_deductions=itemized_deductions,
+            louisiana_agi=agi,
+            verbose=verbose
         )
 
         # Calculate combined totals
         total_tax_liability = federal_calc['total_federal_tax'] + la_calc['total_louisiana_tax']
-        total_income_amount = total_income + other_income
+        combined_effective_rate = (total_tax_liability / agi) if agi > 0 else 0.0
 
         return {
             'tax_year': self.tax_year,
@@ -221,12 +297,100 @@ class CombinedTaxCalculator:
             'depreciation': depreciation,
             'other_income': other_income,
             'net_farm_profit': federal_calc['net_farm_profit'],
-            'agi': federal_calc['agi'],
+            'agi': agi,
             'federal_tax': federal_calc,
             'louisiana_tax': la_calc,
             'total_federal_tax': federal_calc['total_federal_tax'],
             'total_louisiana_tax': la_calc['total_louisiana_tax'],
             'total_tax_liability': total_tax_liability,
-            'combined_effective_rate': (total_tax_liability / federal_calc['agi']) if federal_calc['agi'] > 0 else 0.0,
-            'combined_effective_rate_percent': f"{((total_tax_liability / federal_calc['agi']) * 100) if federal_calc['agi'] > 0 else 0.0:.2f}%"
+            'combined_effective_rate': combined_effective_rate,
+            'combined_effective_rate_percent': f"{combined_effective_rate * 100:.2f}%"
         }
+
+    def calculate_combined_tax_batch(self, total_income, total_expenses, depreciation,
+                                     other_income=0.0, num_exemptions=2, num_dependents=0,
+                                     use_standard_deduction=True, itemized_deductions=0):
+        """
+        Calculate combined federal and Louisiana tax for many scenarios at once.
+
+        Amount arguments may be scalars or 1-D arrays and are broadcast
+        together, e.g. one income against a range of expense levels. The
+        math matches calculate_combined_tax scenario by scenario.
+
+        Args:
+            total_income: Total farm income
+            total_expenses: Total farm expenses
+            depreciation: Total depreciation
+            other_income: Non-farm income
+            num_exemptions: Personal exemptions
+            num_dependents: Dependents
+            use_standard_deduction: Use standard deduction
+            itemized_deductions: Itemized deductions (if not using standard)
+
+        Returns:
+            Structured ndarray of COMBINED_TAX_DTYPE, one record per scenario
+        """
+        total_income, total_expenses, depreciation, other_income = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(a, dtype=np.float64))
+              for a in (total_income, total_expenses, depreciation, other_income))
+        )
+
+        # Federal
+        net_farm_profit = total_income - (total_expenses + depreciation)
+        se_tax = self.federal_calc.calculate_se_tax_array(net_farm_profit)
+        agi = net_farm_profit + other_income - se_tax['deductible_se_tax']
+
+        deduction = self.federal_calc.standard_deduction if use_standard_deduction else itemized_deductions
+        federal_taxable_income = np.maximum(0.0, agi - deduction)
+        federal_income_tax = self.federal_calc.calculate_income_tax_array(federal_taxable_income)
+        total_federal_tax = federal_income_tax + se_tax['total_se_tax']
+
+        # Louisiana, starting from the federal AGI
+        la_taxable_income, la_tax = self.state_calc.calculate_louisiana_income_tax_array(
+            agi,
+            num_exemptions=num_exemptions,
+            num_dependents=num_dependents,
+            federal_itemized_deductions=itemized_deductions,
+            use_standard_deduction=use_standard_deduction
+        )
+
+        total_tax_liability = total_federal_tax + la_tax
+        positive_agi = agi > 0
+
+        result = np.empty(agi.shape, dtype=COMBINED_TAX_DTYPE)
+        result['farm_income'] = total_income
+        result['farm_expenses'] = total_expenses
+        result['depreciation'] = depreciation
+        result['other_income'] = other_income
+        result['net_farm_profit'] = net_farm_profit
+        result['total_se_tax'] = se_tax['total_se_tax']
+        result['agi'] = agi
+        result['federal_taxable_income'] = federal_taxable_income
+        result['federal_income_tax'] = federal_income_tax
+        result['total_federal_tax'] = total_federal_tax
+        result['louisiana_taxable_income'] = la_taxable_income
+        result['total_louisiana_tax'] = la_tax
+        result['total_tax_liability'] = total_tax_liability
+        result['combined_effective_rate'] = np.where(
+            positive_agi, total_tax_liability / np.where(positive_agi, agi, 1.0), 0.0
+        )
+        return result
+
+
+@lru_cache(maxsize=32)
+def get_combined_calculator(filing_status='married_filing_jointly', tax_year=2024):
+    """
+    Get a shared CombinedTaxCalculator for a filing status and tax year.
+
+    Preferred over constructing CombinedTaxCalculator directly when the
+    same settings are used repeatedly (e.g. one calculation per command or
+    page rerun).
+
+    Args:
+        filing_status: Filing status
+        tax_year: Tax year
+
+    Returns:
+        CombinedTaxCalculator instance (shared; do not modify)
+    """
+    return CombinedTaxCalculator(filing_status, tax_year)
@@ -2,25 +2,138 @@
 Transaction management for income and expenses.
 """
 
-from database.models import Transaction, TransactionType, Entity, AccountingMethod
-from database.database import get_session
+from database.models import (
+    Transaction, TransactionAggregate, TransactionType, Entity,
+    AGGREGATE_BASIS_DATES, TX_TYPES, normalize_choice
+)
+from database.database import get_session, rebuild_transaction_aggregates
+from sqlalchemy import case, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from config.tax_constants import FARM_INCOME_CATEGORIES, FARM_EXPENSE_CATEGORIES
-from datetime import datetime
+from datetime import date, datetime, timezone
+from functools import lru_cache
 import logging
+import math
 
 logger = logging.getLogger(__name__)
 
+# Dialects with INSERT ... ON CONFLICT DO UPDATE; others rebuild the
+# entity's aggregates after each write
+_UPSERT_INSERTS = {
+    'sqlite': sqlite.insert,
+    'postgresql': postgresql.insert,
+}
+
+
+@lru_cache(maxsize=256)
+def _year_bounds(year):
+    """First and last day of a year, as dates."""
+    return date(year, 1, 1), date(year, 12, 31)
+
+
+# Transaction columns that feed the aggregates; _aggregate_deltas accepts
+# any object or row with these attributes
+_AGGREGATE_COLUMNS = (
+    Transaction.id, Transaction.entity_id, Transaction.transaction_type,
+    Transaction.category, Transaction.amount, Transaction.is_prepaid_expense,
+    Transaction.is_capital_expense, Transaction.transaction_date,
+    Transaction.cash_date, Transaction.accrual_date,
+)
+_AGGREGATE_COLUMN_NAMES = frozenset(column.key for column in _AGGREGATE_COLUMNS)
+
+# Attributes update_transaction may set
+_TRANSACTION_COLUMN_NAMES = frozenset(Transaction.__mapper__.columns.keys()) - {'id'}
+
+
+def _aggregate_deltas(transaction, sign):
+    """
+    Build the aggregate row changes for a transaction.
+
+    Args:
+        transaction: Transaction (or row of _AGGREGATE_COLUMNS) being added or removed
+        sign: 1 to add the transaction, -1 to remove it
+
+    Returns:
+        List of TransactionAggregate column dicts, one per dated basis
+        (empty for capital expenses)
+    """
+    if transaction.is_capital_expense:
+        return []
+
+    amount = transaction.amount * sign
+    prepaid = amount if transaction.is_prepaid_expense else 0.0
+    deltas = []
+    for basis, date_name in AGGREGATE_BASIS_DATES.items():
+        transaction_date = getattr(transaction, date_name)
+        if transaction_date is None:
+            continue
+        deltas.append({
+            'entity_id': transaction.entity_id,
+            'basis': basis,
+            'year': transaction_date.year,
+            'transaction_type': transaction.transaction_type,
+            'category': transaction.category,
+            'total_amount': amount,
+            'prepaid_total': prepaid,
+            'transaction_count': sign,
+            'first_transaction_id': transaction.id
+        })
+    return deltas
+
+
+def _merge_aggregate_deltas(deltas):
+    """
+    Sum aggregate deltas that target the same aggregate row.
+
+    One multi-row upsert may not touch a row twice (PostgreSQL rejects it),
+    so an update's old and new deltas for the same group are combined, and
+    groups whose changes cancel out are dropped.
+
+    Args:
+        deltas: Rows from _aggregate_deltas
+
+    Returns:
+        List of delta dicts with one entry per aggregate primary key
+    """
+    merged = {}
+    for delta in deltas:
+        key = (delta['entity_id'], delta['basis'], delta['year'], delta['transaction_type'], delta['category'])
+        current = merged.get(key)
+        if current is None:
+            merged[key] = dict(delta)
+        else:
+            current['total_amount'] += delta['total_amount']
+            current['prepaid_total'] += delta['prepaid_total']
+            current['transaction_count'] += delta['transaction_count']
+            current['first_transaction_id'] = min(current['first_transaction_id'], delta['first_transaction_id'])
+    return [
+        delta for delta in merged.values()
+        if delta['transaction_count'] or delta['total_amount'] or delta['prepaid_total']
+    ]
+
 
 class TransactionManager:
     """Manage income and expense transactions."""
 
-    def __init__(self):
-        self.session = get_session()
+    def __init__(self, session=None):
+        """
+        Initialize the manager.
+
+        Args:
+            session: Session to use (default: get_session()). A passed-in
+                session is left open by close().
+        """
+        self._owns_session = session is None
+        self.session = session if session is not None else get_session()
+
+        # Summary results keyed by (kind, entity_id, tax_year, accounting_method);
+        # writes through this manager drop the affected entities' entries
+        self._summary_cache = {}
 
     def add_transaction(self, entity_id, transaction_date, transaction_type,
                        category, amount, description=None, reference_number=None,
                        is_prepaid=False, is_capital=False, cash_date=None,
-                       accrual_date=None, tax_year=None, notes=None):
+                       accrual_date=None, tax_year=None, notes=None, commit=True):
         """
         Add a new transaction.
 
@@ -38,44 +151,28 @@ class TransactionManager:
             accrual_date: Date income earned/expense incurred (for accrual)
             tax_year: Tax year this applies to
             notes: Additional notes
+            commit: Commit immediately; with False the transaction and its
+                aggregate changes are only flushed so the caller can commit
+                several changes together
 
         Returns:
             Transaction object
         """
         try:
-            # Convert string to enum
-            if isinstance(transaction_type, str):
-                transaction_type = TransactionType[transaction_type.upper()]
-
-            # Determine tax year if not provided
-            if tax_year is None:
-                tax_year = transaction_date.year
-
-            # Set cash/accrual dates if not provided
-            if cash_date is None:
-                cash_date = transaction_date
-            if accrual_date is None:
-                accrual_date = transaction_date
-
-            transaction = Transaction(
-                entity_id=entity_id,
-                transaction_date=transaction_date,
-                transaction_type=transaction_type,
-                category=category,
-                amount=amount,
-                description=description,
-                reference_number=reference_number,
-                is_prepaid_expense=is_prepaid,
-                is_capital_expense=is_capital,
-                cash_date=cash_date,
-                accrual_date=accrual_date,
-                tax_year=tax_year,
-                notes=notes
-            )
+            transaction = Transaction(**self._transaction_values(
+                entity_id, transaction_date, transaction_type, category, amount,
+                description=description, reference_number=reference_number,
+                is_prepaid=is_prepaid, is_capital=is_capital, cash_date=cash_date,
+                accrual_date=accrual_date, tax_year=tax_year, notes=notes
+            ))
+            transaction_type = transaction.transaction_type
 
             self.session.add(transaction)
-            self.session.commit()
-            logger.info(f"Added {transaction_type.value} transaction: {category} ${amount:,.2f}")
+            self.session.flush()
+            self._apply_aggregate_deltas(_aggregate_deltas(transaction, 1))
+            if commit:
+                self.session.commit()
+            logger.info(f"Added {transaction_type} transaction: {category} ${amount:,.2f}")
             return transaction
 
         except Exception as e:
@@ -83,6 +180,83 @@ class TransactionManager:
             logger.error(f"Failed to add transaction: {e}")
             raise
 
+    def add_transactions_bulk(self, rows, batch_size=1000):
+        """
+        Add many transactions with batched multi-row INSERTs and one commit.
+
+        Rows are normalized the same way as add_transaction, inserted in
+        Core batches of batch_size, and the affected entities' aggregates
+        are rebuilt once at the end.
+
+        Args:
+            rows: List of dictionaries of add_transaction keyword arguments
+            batch_size: Rows per INSERT batch
+
+        Returns:
+            Number of transactions added
+        """
+        if not rows:
+            return 0
+
+        try:
+            stmt = insert(Transaction)
+            batch = []
+            for row in rows:
+                batch.append(self._transaction_values(**row))
+                if len(batch) == batch_size:
+                    self.session.execute(stmt, batch)
+                    batch = []
+            if batch:
+                self.session.execute(stmt, batch)
+
+            entity_ids = {row['entity_id'] for row in rows}
+            for entity_id in entity_ids:
+                rebuild_transaction_aggregates(self.session, entity_id)
+            self._invalidate_summaries(entity_ids)
+
+            self.session.commit()
+            logger.info(f"Added {len(rows)} transactions")
+            return len(rows)
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to add transactions: {e}")
+            raise
+
+    def _transaction_values(self, entity_id, transaction_date, transaction_type,
+                            category, amount, description=None, reference_number=None,
+                            is_prepaid=False, is_capital=False, cash_date=None,
+                            accrual_date=None, tax_year=None, notes=None):
+        """Build Transaction column values from add_transaction arguments, applying its defaults."""
+        # Normalize enum member/string to stored value
+        transaction_type = normalize_choice(transaction_type, TX_TYPES)
+
+        # Determine tax year if not provided
+        if tax_year is None:
+            tax_year = transaction_date.year
+
+        # Set cash/accrual dates if not provided
+        if cash_date is None:
+            cash_date = transaction_date
+        if accrual_date is None:
+            accrual_date = transaction_date
+
+        return {
+            'entity_id': entity_id,
+            'transaction_date': transaction_date,
+            'transaction_type': transaction_type,
+            'category': category,
+            'amount': amount,
+            'description': description,
+            'reference_number': reference_number,
+            'is_prepaid_expense': is_prepaid,
+            'is_capital_expense': is_capital,
+            'cash_date': cash_date,
+            'accrual_date': accrual_date,
+            'tax_year': tax_year,
+            'notes': notes
+        }
+
     def get_transaction(self, transaction_id):
         """Get transaction by ID."""
         return self.session.query(Transaction).filter_by(id=transaction_id).first()
@@ -102,22 +276,38 @@ class TransactionManager:
         Returns:
             List of Transaction objects
         """
-        query = self.session.query(Transaction).filter_by(entity_id=entity_id)
+        return list(self.iter_transactions_by_entity(
+            entity_id, start_date, end_date, transaction_type, category
+        ))
+
+    def iter_transactions_by_entity(self, entity_id, start_date=None, end_date=None,
+                                    transaction_type=None, category=None, batch_size=1000):
+        """
+        Stream transactions for an entity, loading batch_size rows at a time.
+
+        Takes the same filters as get_transactions_by_entity; use this for
+        long histories so only one batch of Transaction objects is built
+        at a time.
+
+        Returns:
+            Iterable of Transaction objects in date order
+        """
+        stmt = select(Transaction).where(Transaction.entity_id == entity_id)
 
         if start_date:
-            query = query.filter(Transaction.transaction_date >= start_date)
+            stmt = stmt.where(Transaction.transaction_date >= start_date)
         if end_date:
-            query = query.filter(Transaction.transaction_date <= end_date)
+            stmt = stmt.where(Transaction.transaction_date <= end_date)
         if transaction_type:
-            if isinstance(transaction_type, str):
-                transaction_type = TransactionType[transaction_type.upper()]
-            query = query.filter_by(transaction_type=transaction_type)
+            transaction_type = normalize_choice(transaction_type, TX_TYPES)
+            stmt = stmt.where(Transaction.transaction_type == transaction_type)
         if category:
-            query = query.filter_by(category=category)
+            stmt = stmt.where(Transaction.category == category)
 
-        return query.order_by(Transaction.transaction_date).all()
+        stmt = stmt.order_by(Transaction.transaction_date).execution_options(yield_per=batch_size)
+        return self.session.execute(stmt).scalars()
 
-    def get_transactions_for_tax_year(self, entity_id, tax_year, accounting_method='cash'):
+    def get_transactions_for_tax_year(self, entity_id, tax_year, accounting_method='cash', entity=None):
         """
         Get transactions for a tax year using specified accounting method.
 
@@ -125,46 +315,34 @@ class TransactionManager:
             entity_id: Entity ID
             tax_year: Tax year
             accounting_method: 'cash' or 'accrual'
+            entity: The Entity, if already loaded (skips the entity lookup)
 
         Returns:
             Dictionary with income and expense transactions
         """
-        # Get entity to check accounting method
-        entity = self.session.query(Entity).filter_by(id=entity_id).first()
-        if not entity:
-            raise ValueError(f"Entity {entity_id} not found")
-
-        # Use entity's accounting method if not specified
-        if accounting_method is None:
-            accounting_method = entity.accounting_method.value
-
-        # Determine which date to use
-        if accounting_method == 'cash':
-            date_field = Transaction.cash_date
-        elif accounting_method == 'accrual':
-            date_field = Transaction.accrual_date
-        else:
-            date_field = Transaction.transaction_date
+        date_field, accounting_method = self._date_field(entity_id, accounting_method, entity)
 
         # Query for tax year
-        start_date = datetime(tax_year, 1, 1).date()
-        end_date = datetime(tax_year, 12, 31).date()
+        start_date, end_date = _year_bounds(tax_year)
 
-        income_transactions = self.session.query(Transaction).filter(
+        # One query for both types, split in a single pass
+        income_type = TransactionType.INCOME.value
+        expense_type = TransactionType.EXPENSE.value
+        transactions = self.session.query(Transaction).filter(
             Transaction.entity_id == entity_id,
-            Transaction.transaction_type == TransactionType.INCOME,
+            Transaction.transaction_type.in_((income_type, expense_type)),
             date_field >= start_date,
             date_field <= end_date,
             Transaction.is_capital_expense == False
         ).all()
 
-        expense_transactions = self.session.query(Transaction).filter(
-            Transaction.entity_id == entity_id,
-            Transaction.transaction_type == TransactionType.EXPENSE,
-            date_field >= start_date,
-            date_field <= end_date,
-            Transaction.is_capital_expense == False
-        ).all()
+        income_transactions = []
+        expense_transactions = []
+        for transaction in transactions:
+            if transaction.transaction_type == income_type:
+                income_transactions.append(transaction)
+            else:
+                expense_transactions.append(transaction)
 
         return {
             'income': income_transactions,
@@ -172,7 +350,188 @@ class TransactionManager:
             'accounting_method': accounting_method
         }
 
-    def get_income_summary(self, entity_id, tax_year, accounting_method='cash'):
+    def _basis(self, entity_id, accounting_method, entity=None):
+        """
+        Get the aggregate basis that places a transaction in a tax year.
+
+        Args:
+            entity_id: Entity ID
+            accounting_method: 'cash', 'accrual', or None for the entity's method
+            entity: The Entity, if the caller already has it (skips the lookup)
+
+        Returns:
+            Tuple of (basis key of AGGREGATE_BASIS_DATES, resolved accounting method)
+        """
+        if entity is not None:
+            entity_method = entity.accounting_method
+        else:
+            # Only the accounting method is needed; a missing row means no entity
+            entity_method = self.session.execute(
+                select(Entity.accounting_method).where(Entity.id == entity_id)
+            ).scalar_one_or_none()
+            if entity_method is None:
+                raise ValueError(f"Entity {entity_id} not found")
+
+        # Use entity's accounting method if not specified
+        if accounting_method is None:
+            accounting_method = entity_method
+
+        # Cash and accrual use their own dates; anything else the transaction date
+        basis = accounting_method if accounting_method in ('cash', 'accrual') else 'transaction'
+        return basis, accounting_method
+
+    def _date_field(self, entity_id, accounting_method, entity=None):
+        """
+        Get the date column that places a transaction in a tax year.
+
+        Args:
+            entity_id: Entity ID
+            accounting_method: 'cash', 'accrual', or None for the entity's method
+            entity: The Entity, if the caller already has it (skips the lookup)
+
+        Returns:
+            Tuple of (Transaction date column, resolved accounting method)
+        """
+        basis, accounting_method = self._basis(entity_id, accounting_method, entity)
+        return getattr(Transaction, AGGREGATE_BASIS_DATES[basis]), accounting_method
+
+    def _apply_aggregate_deltas(self, deltas, removed_id=None):
+        """
+        Fold transaction changes into the aggregates table.
+
+        Runs in the caller's transaction, after the transaction rows are
+        flushed, so the aggregates commit or roll back with them.
+
+        Args:
+            deltas: Rows from _aggregate_deltas
+            removed_id: ID of a transaction removed from (or moved between)
+                groups, whose groups may need a new first_transaction_id
+        """
+        if not deltas:
+            return
+        self._invalidate_summaries({delta['entity_id'] for delta in deltas})
+        deltas = _merge_aggregate_deltas(deltas)
+        if not deltas:
+            return
+
+        upsert_insert = _UPSERT_INSERTS.get(self.session.get_bind().dialect.name)
+        if upsert_insert is None:
+            for entity_id in {delta['entity_id'] for delta in deltas}:
+                rebuild_transaction_aggregates(self.session, entity_id)
+            return
+
+        agg = TransactionAggregate.__table__.c
+        stmt = upsert_insert(TransactionAggregate)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[agg.entity_id, agg.basis, agg.year, agg.transaction_type, agg.category],
+            set_={
+                'total_amount': agg.total_amount + stmt.excluded.total_amount,
+                'prepaid_total': agg.prepaid_total + stmt.excluded.prepaid_total,
+                'transaction_count': agg.transaction_count + stmt.excluded.transaction_count,
+                'first_transaction_id': case(
+                    (stmt.excluded.first_transaction_id < agg.first_transaction_id,
+                     stmt.excluded.first_transaction_id),
+                    else_=agg.first_transaction_id
+                )
+            }
+        )
+        self.session.execute(stmt, deltas)
+
+        if removed_id is None:
+            return
+
+        for entity_id in {delta['entity_id'] for delta in deltas}:
+            # Groups left without transactions
+            self.session.execute(delete(TransactionAggregate).where(
+                TransactionAggregate.entity_id == entity_id,
+                TransactionAggregate.transaction_count <= 0
+            ))
+
+        # Groups whose first transaction was the removed one. Only groups it
+        # left (net count below zero) can lose their first id; the upsert
+        # keeps the others right.
+        for delta in deltas:
+            if delta['transaction_count'] >= 0:
+                continue
+            date_field = getattr(Transaction, AGGREGATE_BASIS_DATES[delta['basis']])
+            start_date, end_date = _year_bounds(delta['year'])
+            first_id = select(func.min(Transaction.id)).where(
+                Transaction.entity_id == delta['entity_id'],
+                Transaction.transaction_type == delta['transaction_type'],
+                Transaction.category == delta['category'],
+                date_field >= start_date,
+                date_field <= end_date,
+                Transaction.is_capital_expense == False
+            ).scalar_subquery()
+            self.session.execute(update(TransactionAggregate).where(
+                TransactionAggregate.entity_id == delta['entity_id'],
+                TransactionAggregate.basis == delta['basis'],
+                TransactionAggregate.year == delta['year'],
+                TransactionAggregate.transaction_type == delta['transaction_type'],
+                TransactionAggregate.category == delta['category'],
+                TransactionAggregate.first_transaction_id == removed_id
+            ).values(first_transaction_id=first_id))
+
+    def _invalidate_summaries(self, entity_ids=None):
+        """
+        Drop cached summaries.
+
+        Args:
+            entity_ids: Entity IDs whose summaries changed (default: all)
+        """
+        if entity_ids is None:
+            self._summary_cache.clear()
+            return
+        for key in [key for key in self._summary_cache if key[1] in entity_ids]:
+            del self._summary_cache[key]
+
+    def rebuild_aggregates(self, entity_id=None):
+        """
+        Recompute the transaction aggregates from the transactions table.
+
+        Needed only after transactions are written outside this manager.
+
+        Args:
+            entity_id: Only rebuild this entity (default: all entities)
+        """
+        try:
+            rebuild_transaction_aggregates(self.session, entity_id)
+            self._invalidate_summaries(None if entity_id is None else {entity_id})
+            self.session.commit()
+            logger.info(f"Rebuilt transaction aggregates{'' if entity_id is None else f' for entity {entity_id}'}")
+
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to rebuild transaction aggregates: {e}")
+            raise
+
+    def _totals_by_category(self, entity_id, tax_year, accounting_method, transaction_type, entity=None):
+        """
+        Read non-capital transaction totals by category from the aggregates.
+
+        Categories are returned in order of their first transaction, matching
+        the order of a row-by-row scan.
+
+        Returns:
+            Tuple of (dict of category -> total, overall total)
+        """
+        basis, _ = self._basis(entity_id, accounting_method, entity)
+
+        rows = self.session.query(
+            TransactionAggregate.category,
+            TransactionAggregate.total_amount
+        ).filter(
+            TransactionAggregate.entity_id == entity_id,
+            TransactionAggregate.basis == basis,
+            TransactionAggregate.year == tax_year,
+            TransactionAggregate.transaction_type == transaction_type
+        ).order_by(TransactionAggregate.first_transaction_id)
+
+        # Running totals of cent amounts; rounding drops float residue
+        by_category = {category: round(float(total), 2) for category, total in rows}
+        return by_category, math.fsum(by_category.values())
+
+    def get_income_summary(self, entity_id, tax_year, accounting_method='cash', entity=None):
         """
         Get income summary by category for a tax year.
 
@@ -180,31 +539,30 @@ class TransactionManager:
             entity_id: Entity ID
             tax_year: Tax year
             accounting_method: Accounting method
+            entity: The Entity, if already loaded (skips the entity lookup)
 
         Returns:
-            Dictionary with income by category
+            Dictionary with income by category (cached per manager; do not modify)
         """
-        transactions = self.get_transactions_for_tax_year(
-            entity_id, tax_year, accounting_method
-        )
+        key = ('income', entity_id, tax_year, accounting_method)
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
 
-        income_by_category = {}
-        total_income = 0.0
-
-        for trans in transactions['income']:
-            if trans.category not in income_by_category:
-                income_by_category[trans.category] = 0.0
-            income_by_category[trans.category] += trans.amount
-            total_income += trans.amount
+        income_by_category, total_income = self._totals_by_category(
+            entity_id, tax_year, accounting_method, TransactionType.INCOME.value, entity
+        )
 
-        return {
+        summary = {
             'tax_year': tax_year,
             'entity_id': entity_id,
             'by_category': income_by_category,
             'total_income': total_income
         }
+        self._summary_cache[key] = summary
+        return summary
 
-    def get_expense_summary(self, entity_id, tax_year, accounting_method='cash'):
+    def get_expense_summary(self, entity_id, tax_year, accounting_method='cash', entity=None):
         """
         Get expense summary by category for a tax year.
 
@@ -212,29 +570,28 @@ class TransactionManager:
             entity_id: Entity ID
             tax_year: Tax year
             accounting_method: Accounting method
+            entity: The Entity, if already loaded (skips the entity lookup)
 
         Returns:
-            Dictionary with expenses by category
+            Dictionary with expenses by category (cached per manager; do not modify)
         """
-        transactions = self.get_transactions_for_tax_year(
-            entity_id, tax_year, accounting_method
-        )
+        key = ('expense', entity_id, tax_year, accounting_method)
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
 
-        expense_by_category = {}
-        total_expenses = 0.0
-
-        for trans in transactions['expenses']:
-            if trans.category not in expense_by_category:
-                expense_by_category[trans.category] = 0.0
-            expense_by_category[trans.category] += trans.amount
-            total_expenses += trans.amount
+        expense_by_category, total_expenses = self._totals_by_category(
+            entity_id, tax_year, accounting_method, TransactionType.EXPENSE.value, entity
+        )
 
-        return {
+        summary = {
             'tax_year': tax_year,
             'entity_id': entity_id,
             'by_category': expense_by_category,
             'total_expenses': total_expenses
         }
+        self._summary_cache[key] = summary
+        return summary
 
     def validate_prepaid_expenses(self, entity_id, tax_year):
         """
@@ -248,22 +605,34 @@ class TransactionManager:
             tax_year: Tax year
 
         Returns:
-            Dictionary with validation results
+            Dictionary with validation results (cached per manager; do not modify)
         """
-        expense_summary = self.get_expense_summary(entity_id, tax_year)
-
-        prepaid_expenses = sum(
-            trans.amount
-            for trans in self.get_transactions_for_tax_year(entity_id, tax_year)['expenses']
-            if trans.is_prepaid_expense
-        )
-
-        other_expenses = expense_summary['total_expenses'] - prepaid_expenses
+        key = ('prepaid', entity_id, tax_year, 'cash')
+        cached = self._summary_cache.get(key)
+        if cached is not None:
+            return cached
+
+        basis, _ = self._basis(entity_id, 'cash')
+
+        # Total and prepaid expenses from the aggregates, in one query
+        total_expenses, prepaid_expenses = self.session.query(
+            func.coalesce(func.sum(TransactionAggregate.total_amount), 0),
+            func.coalesce(func.sum(TransactionAggregate.prepaid_total), 0)
+        ).filter(
+            TransactionAggregate.entity_id == entity_id,
+            TransactionAggregate.basis == basis,
+            TransactionAggregate.year == tax_year,
+            TransactionAggregate.transaction_type == TransactionType.EXPENSE.value
+        ).one()
+        total_expenses = round(float(total_expenses), 2)
+        prepaid_expenses = round(float(prepaid_expenses), 2)
+
+        other_expenses = total_expenses - prepaid_expenses
 
         max_allowed_prepaid = other_expenses * 0.50
         exceeds_limit = prepaid_expenses > max_allowed_prepaid
 
-        return {
+        validation = {
             'tax_year': tax_year,
             'prepaid_expenses': prepaid_expenses,
             'other_expenses': other_expenses,
@@ -271,15 +640,32 @@ class TransactionManager:
             'exceeds_limit': exceeds_limit,
             'excess_amount': max(0, prepaid_expenses - max_allowed_prepaid)
         }
+        self._summary_cache[key] = validation
+        return validation
 
     def delete_transaction(self, transaction_id):
-        """Delete a transaction."""
+        """
+        Delete a transaction.
+
+        The row is deleted without loading it; RETURNING hands back the
+        columns the aggregates need.
+        """
         try:
-            transaction = self.get_transaction(transaction_id)
-            if not transaction:
+            # 'fetch' matches session objects by primary key, including
+            # expired ones the default evaluation can't test
+            stmt = delete(Transaction).where(Transaction.id == transaction_id).execution_options(
+                synchronize_session='fetch'
+            )
+            if self.session.get_bind().dialect.delete_returning:
+                removed_row = self.session.execute(stmt.returning(*_AGGREGATE_COLUMNS)).first()
+            else:
+                removed_row = self._aggregate_row(transaction_id)
+                if removed_row is not None:
+                    self.session.execute(stmt)
+            if removed_row is None:
                 raise ValueError(f"Transaction {transaction_id} not found")
 
-            self.session.delete(transaction)
+            self._apply_aggregate_deltas(_aggregate_deltas(removed_row, -1), removed_id=transaction_id)
             self.session.commit()
             logger.info(f"Deleted transaction {transaction_id}")
             return True
@@ -290,26 +676,59 @@ class TransactionManager:
             raise
 
     def update_transaction(self, transaction_id, **kwargs):
-        """Update transaction attributes."""
+        """
+        Update transaction columns with a single UPDATE.
+
+        Keyword arguments that are not Transaction columns are ignored.
+        The row is not loaded; changes to amount, type, category, dates or
+        the prepaid/capital flags first read those columns so the
+        aggregates can be adjusted.
+
+        Returns:
+            True if the transaction was updated
+        """
         try:
-            transaction = self.get_transaction(transaction_id)
-            if not transaction:
-                raise ValueError(f"Transaction {transaction_id} not found")
+            values = {key: value for key, value in kwargs.items() if key in _TRANSACTION_COLUMN_NAMES}
+            if 'transaction_type' in values:
+                values['transaction_type'] = normalize_choice(values['transaction_type'], TX_TYPES)
+            values['updated_at'] = datetime.now(timezone.utc).replace(tzinfo=None)
 
-            for key, value in kwargs.items():
-                if hasattr(transaction, key):
-                    setattr(transaction, key, value)
+            stmt = update(Transaction).where(Transaction.id == transaction_id).values(**values).execution_options(
+                synchronize_session='fetch'
+            )
+            if _AGGREGATE_COLUMN_NAMES.isdisjoint(values):
+                if self.session.execute(stmt).rowcount == 0:
+                    raise ValueError(f"Transaction {transaction_id} not found")
+            else:
+                old_row = self._aggregate_row(transaction_id)
+                if old_row is None:
+                    raise ValueError(f"Transaction {transaction_id} not found")
+                if self.session.get_bind().dialect.update_returning:
+                    new_row = self.session.execute(stmt.returning(*_AGGREGATE_COLUMNS)).first()
+                else:
+                    self.session.execute(stmt)
+                    new_row = self._aggregate_row(transaction_id)
+                self._apply_aggregate_deltas(
+                    _aggregate_deltas(old_row, -1) + _aggregate_deltas(new_row, 1),
+                    removed_id=transaction_id
+                )
 
-            transaction.updated_at = datetime.utcnow()
             self.session.commit()
             logger.info(f"Updated transaction {transaction_id}")
-            return transaction
+            return True
 
         except Exception as e:
             self.session.rollback()
             logger.error(f"Failed to update transaction: {e}")
             raise
 
+    def _aggregate_row(self, transaction_id):
+        """Fetch a transaction's _AGGREGATE_COLUMNS as a row (None if missing)."""
+        return self.session.execute(
+            select(*_AGGREGATE_COLUMNS).where(Transaction.id == transaction_id)
+        ).first()
+
     def close(self):
-        """Close database session."""
-        self.session.close()
+        """Close database session (only if this manager opened it)."""
+        if self._owns_session:
+            self.session.close()